@@ -75,6 +75,8 @@ async def store_api_key(request: APIKeyRequest):
         )
         
         if success:
+            from utils.model_compatibility import invalidate_api_key_cache
+            invalidate_api_key_cache(request.provider)
             return APIKeyResponse(
                 success=True,
                 message=f"API key stored successfully for {request.provider}",
@@ -109,6 +111,8 @@ async def delete_api_key(provider: str):
         success = await api_key_manager.delete_api_key(provider.lower())
         
         if success:
+            from utils.model_compatibility import invalidate_api_key_cache
+            invalidate_api_key_cache(provider.lower())
             return APIKeyResponse(
                 success=True,
                 message=f"API key deleted successfully for {provider}",
@@ -10,6 +10,7 @@ import logging
 from typing import Optional, Any
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from core.global_settings_manager import global_settings_manager, GlobalSettingsConfig
@@ -22,7 +23,8 @@ logger = logging.getLogger("global-settings-api")
 app = FastAPI(
     title="Global Settings API",
     description="API for managing global application settings",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -236,4 +238,6 @@ async def preview_combined_prompt(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8084) 
\ No newline at end of file
+    from utils.access_log import SampledLogger
+    app.add_middleware(SampledLogger)
+    uvicorn.run(app, host="0.0.0.0", port=8084, access_log=False) 
\ No newline at end of file
@@ -8,6 +8,7 @@ FastAPI endpoints for managing MCP server configurations.
 import os
 from dotenv import load_dotenv
 import asyncio
+import dataclasses
 from typing import Dict, List, Optional, Any
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
@@ -57,6 +58,22 @@ class MCPServerConfigAPI(BaseModel):
     retry_count: int = Field(3, description="Number of connection retries")
     health_check_interval: int = Field(60, description="Health check interval in seconds")
 
+class MCPServerPatchAPI(BaseModel):
+    """Partial server update (JSON merge patch): only the fields sent are changed"""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    server_type: Optional[MCPServerType] = None
+    url: Optional[str] = None
+    command: Optional[str] = None
+    args: Optional[List[str]] = None
+    env: Optional[Dict[str, str]] = None
+    auth: Optional[AuthConfigAPI] = None
+    enabled: Optional[bool] = None
+    timeout: Optional[float] = None
+    sse_read_timeout: Optional[float] = None
+    retry_count: Optional[int] = None
+    health_check_interval: Optional[int] = None
+
 class MCPServerStatusResponse(BaseModel):
     server_id: str
     name: str
@@ -390,6 +407,34 @@ async def update_server(server_id: str, server_config: MCPServerConfigAPI, manag
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating server: {e}")
 
+@app.patch("/servers/{server_id}", response_model=APIResponse)
+async def patch_server(server_id: str, patch: MCPServerPatchAPI, manager = Depends(get_mcp_manager)):
+    """Partially update an MCP server configuration (accepts application/merge-patch+json)"""
+    try:
+        current = manager.get_server(server_id)
+        if not current:
+            raise HTTPException(status_code=404, detail=f"Server {server_id} not found")
+        
+        # Only fields present in the request body are merged into the stored config
+        changes = patch.model_dump(exclude_unset=True)
+        if changes.get('auth') is not None:
+            changes['auth'] = AuthConfig(**changes['auth'])
+        config = dataclasses.replace(current, **changes)
+        
+        success = await manager.update_server(server_id, config)
+        if not success:
+            raise HTTPException(status_code=500, detail="Failed to update server")
+        
+        return APIResponse(
+            success=True,
+            message=f"Server {server_id} updated successfully",
+            data=config.to_dict()
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating server: {e}")
+
 @app.delete("/servers/{server_id}", response_model=APIResponse)
 async def delete_server(server_id: str, manager = Depends(get_mcp_manager)):
     """Delete an MCP server configuration"""
@@ -768,6 +813,16 @@ async def memory_status():
             data={"error": str(e)}
         )
 
+def create_standalone_app() -> FastAPI:
+    """The MCP API with sampled access logging, for running it on its own.
+
+    start_combined.py mounts ``app`` under a parent that already samples
+    requests, so the middleware is only added when this app is served directly.
+    """
+    from utils.access_log import SampledLogger
+    app.add_middleware(SampledLogger)
+    return app
+
 # Development server
 def main():
     """Run the MCP API server"""
@@ -779,19 +834,22 @@ def main():
     if debug:
         # Use module string for reload to work properly
         uvicorn.run(
-            "mcp_api:app",  # Use module:app format for reload
+            "mcp_api:create_standalone_app",  # Use module:factory format for reload
+            factory=True,
             host="0.0.0.0", 
             port=port, 
             reload=True,
-            log_level="info"
+            log_level="info",
+            access_log=False
         )
     else:
         # Production mode - use app instance directly
         uvicorn.run(
-            app, 
+            create_standalone_app(), 
             host="0.0.0.0", 
             port=port, 
-            reload=False
+            reload=False,
+            access_log=False
         )
 
 if __name__ == "__main__":
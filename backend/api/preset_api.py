@@ -11,7 +11,7 @@ import logging
 from typing import Dict, List, Optional, Any, Literal
 from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
@@ -30,7 +30,8 @@ logger = logging.getLogger("preset-api")
 app = FastAPI(
     title="Agent Preset API",
     description="API for managing voice agent preset configurations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -130,6 +131,12 @@ async def startup():
         logger.warning("Preset API will run with limited functionality")
         # Don't raise the exception - let the server start anyway
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the model capability detector's shared HTTP client"""
+    from utils.model_compatibility import shutdown as shutdown_model_compatibility
+    await shutdown_model_compatibility()
+
 @app.get("/health", response_model=APIResponse)
 async def health_endpoint():
     """Health check endpoint"""
@@ -773,4 +780,6 @@ async def create_default_presets_endpoint(manager = Depends(get_preset_manager))
 
 if __name__ == "__main__":
     port = int(os.getenv("PRESET_API_PORT", 8083))
-    uvicorn.run(app, host="0.0.0.0", port=port, reload=False)  # disable auto-reload to avoid crashes 
\ No newline at end of file
+    from utils.access_log import SampledLogger
+    app.add_middleware(SampledLogger)
+    uvicorn.run(app, host="0.0.0.0", port=port, reload=False, access_log=False)  # disable auto-reload to avoid crashes 
\ No newline at end of file
@@ -34,10 +34,11 @@ def main():
         
         # Start the API server
         subprocess.run([
-            sys.executable, "-m", "uvicorn", "mcp_api:app", 
+            sys.executable, "-m", "uvicorn", "mcp_api:create_standalone_app", "--factory",
             "--host", "0.0.0.0", 
             "--port", os.environ.get('MCP_API_PORT', '8082'),
-            "--reload" if os.environ.get('DEBUG', 'false').lower() == 'true' else "--no-reload"
+            "--reload" if os.environ.get('DEBUG', 'false').lower() == 'true' else "--no-reload",
+            "--no-access-log"
         ], check=True)
         
     except KeyboardInterrupt:
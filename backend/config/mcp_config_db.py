@@ -137,15 +137,9 @@ class OpenAIToolsServer:
             async with self.session.get(f"{self.config.url}/tools") as response:
                 if response.status == 200:
                     tools = await response.json()
-                    # Cache tools and save to database
-                    for tool in tools:
-                        _init_db, _health_check, db_manager = _lazy_db_stuff()
-                        await db_manager.save_tool_info(
-                            self.config.id,
-                            tool.get('name', ''),
-                            tool.get('description', ''),
-                            tool
-                        )
+                    # Cache tools and save to database in one bulk upsert
+                    _init_db, _health_check, db_manager = _lazy_db_stuff()
+                    await db_manager.save_tools_bulk(self.config.id, tools)
                     return tools
                 else:
                     print(f"Error listing tools: {response.status}")
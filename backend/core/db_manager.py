@@ -7,15 +7,40 @@ replacing the JSON file storage with PostgreSQL persistence.
 """
 
 import asyncio
+import json
+from itertools import islice
 from typing import Dict, List, Optional, Any  # noqa: F401
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 
 from .database import get_db_session, MCPServer, ServerStatus, ToolInfo
 from typing import Any, Dict, Optional, List
 
+# Streaming JSON parser for large migration files
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Servers converted and upserted per batch during JSON migration
+MIGRATION_BATCH_SIZE = 1000
+
+
+def _iter_json_servers(json_file_path: str):
+    """Yield (server_id, server_data) pairs from the file's "servers" object"""
+    if IJSON_AVAILABLE:
+        # Parses one server at a time instead of loading the whole document
+        with open(json_file_path, 'rb') as f:
+            yield from ijson.kvitems(f, 'servers', use_float=True)
+    else:
+        with open(json_file_path, 'r') as f:
+            yield from json.load(f).get('servers', {}).items()
+
+
 # Lazy import to avoid circular dependency between
 # config.mcp_config_db -> core.db_manager -> config.mcp_config_db
 def _get_mcp_types():
@@ -116,6 +141,36 @@ class DatabaseManager:
             print(f"Error saving server {config.id}: {e}")
             return False
     
+    async def save_servers_bulk(self, configs: List[Any]) -> bool:
+        """Upsert several MCP server configurations in a single executemany round-trip"""
+        if not configs:
+            return True
+        
+        try:
+            async with get_db_session() as session:
+                await self._upsert_servers(session, configs)
+                await session.commit()
+                self._cache_dirty = True
+                return True
+                
+        except Exception as e:
+            print(f"Error saving {len(configs)} servers: {e}")
+            return False
+    
+    async def _upsert_servers(self, session, configs: List[Any]) -> None:
+        """Queue an upsert of *configs* on *session*; the caller commits"""
+        now = datetime.utcnow()
+        # Keyed by id: Postgres rejects an upsert that touches the same row twice,
+        # so a repeated id keeps its last entry, as sequential saves would
+        rows = list({config.id: self._config_to_row(config, now) for config in configs}.values())
+        stmt = pg_insert(MCPServer)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MCPServer.id],
+            # Keep created_at from the existing row, overwrite everything else
+            set_={key: stmt.excluded[key] for key in rows[0] if key not in ("id", "created_at")}
+        )
+        await session.execute(stmt, rows)
+    
     async def delete_server(self, server_id: str) -> bool:
         """Delete MCP server from database"""
         try:
@@ -257,6 +312,45 @@ class DatabaseManager:
             print(f"Error saving tool info {server_id}:{tool_name}: {e}")
             return False
     
+    async def save_tools_bulk(self, server_id: str, tools: List[Dict[str, Any]]) -> bool:
+        """Upsert all tools listed by one MCP server in a single executemany round-trip"""
+        if not tools:
+            return True
+        
+        now = datetime.utcnow()
+        # Keyed by id so a repeated tool name keeps its last entry, as sequential saves would
+        rows = {}
+        for tool in tools:
+            tool_name = tool.get('name', '')
+            tool_id = f"{server_id}:{tool_name}"
+            rows[tool_id] = {
+                "id": tool_id,
+                "server_id": server_id,
+                "tool_name": tool_name,
+                "tool_description": tool.get('description', ''),
+                "tool_schema": tool,
+                "created_at": now,
+                "updated_at": now,
+            }
+        try:
+            async with get_db_session() as session:
+                stmt = pg_insert(ToolInfo)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ToolInfo.id],
+                    set_={
+                        "tool_description": stmt.excluded.tool_description,
+                        "tool_schema": stmt.excluded.tool_schema,
+                        "updated_at": stmt.excluded.updated_at,
+                    }
+                )
+                await session.execute(stmt, list(rows.values()))
+                await session.commit()
+                return True
+                
+        except Exception as e:
+            print(f"Error saving {len(rows)} tools for {server_id}: {e}")
+            return False
+    
     async def get_tools_for_server(self, server_id: str) -> List[Dict[str, Any]]:
         """Get all tools for a specific server"""
         try:
@@ -284,35 +378,39 @@ class DatabaseManager:
     async def migrate_from_json(self, json_file_path: str) -> bool:
         """Migrate data from JSON file to database"""
         try:
-            import json
-            with open(json_file_path, 'r') as f:
-                data = json.load(f)
-            
-            servers = data.get('servers', {})
+            # Convert to MCPServerConfig via lazy types
+            _MCPServerConfig, _MCPServerType, _AuthType, _AuthConfig = _get_mcp_types()
+            servers = _iter_json_servers(json_file_path)
             migrated_count = 0
             
-            for server_id, server_data in servers.items():
-                # Convert to MCPServerConfig via lazy types
-                _MCPServerConfig, _MCPServerType, _AuthType, _AuthConfig = _get_mcp_types()
-                config = _MCPServerConfig(
-                    id=server_id,
-                    name=server_data['name'],
-                    description=server_data['description'],
-                    server_type=_MCPServerType(server_data['server_type']),
-                    url=server_data.get('url'),
-                    command=server_data.get('command'),
-                    args=server_data.get('args'),
-                    env=server_data.get('env'),
-                    auth=self._dict_to_auth(server_data.get('auth'), _AuthType, _AuthConfig) if server_data.get('auth') else None,
-                    enabled=server_data.get('enabled', True),
-                    timeout=server_data.get('timeout', 5.0),
-                    sse_read_timeout=server_data.get('sse_read_timeout', 300.0),
-                    retry_count=server_data.get('retry_count', 3),
-                    health_check_interval=server_data.get('health_check_interval', 60)
-                )
+            # Every batch goes into one transaction, so a failure part-way
+            # through rolls back the batches before it as well
+            async with get_db_session() as session:
+                while batch := list(islice(servers, MIGRATION_BATCH_SIZE)):
+                    configs = [
+                        _MCPServerConfig(
+                            id=server_id,
+                            name=server_data['name'],
+                            description=server_data['description'],
+                            server_type=_MCPServerType(server_data['server_type']),
+                            url=server_data.get('url'),
+                            command=server_data.get('command'),
+                            args=server_data.get('args'),
+                            env=server_data.get('env'),
+                            auth=self._dict_to_auth(server_data.get('auth'), _AuthType, _AuthConfig) if server_data.get('auth') else None,
+                            enabled=server_data.get('enabled', True),
+                            timeout=server_data.get('timeout', 5.0),
+                            sse_read_timeout=server_data.get('sse_read_timeout', 300.0),
+                            retry_count=server_data.get('retry_count', 3),
+                            health_check_interval=server_data.get('health_check_interval', 60)
+                        )
+                        for server_id, server_data in batch
+                    ]
                 
-                if await self.save_server(config):
-                    migrated_count += 1
+                    await self._upsert_servers(session, configs)
+                    migrated_count += len(configs)
+                await session.commit()
+                self._cache_dirty = True
             
             print(f"Migrated {migrated_count} servers from JSON file")
             return True
@@ -340,6 +438,27 @@ class DatabaseManager:
             health_check_interval=db_server.health_check_interval
         )
     
+    def _config_to_row(self, config: Any, now: datetime) -> Dict[str, Any]:
+        """Convert MCPServerConfig to a column dict for bulk upserts"""
+        return {
+            "id": config.id,
+            "name": config.name,
+            "description": config.description,
+            "server_type": config.server_type.value,
+            "url": config.url,
+            "command": config.command,
+            "args": config.args,
+            "env": config.env,
+            "auth": self._auth_to_dict(config.auth) if config.auth else None,
+            "enabled": config.enabled,
+            "timeout": config.timeout,
+            "sse_read_timeout": config.sse_read_timeout,
+            "retry_count": config.retry_count,
+            "health_check_interval": config.health_check_interval,
+            "created_at": now,
+            "updated_at": now
+        }
+    
     def _auth_to_dict(self, auth: Any) -> Dict[str, Any]:
         """Convert AuthConfig to dictionary"""
         if not auth:
@@ -14,15 +14,18 @@ CONSOLIDATED FUNCTIONALITY:
 
 import logging
 import asyncio
+import functools
 import json
 import os
 import re
+import sys
 import time
 import requests
 import numpy as np
 from collections.abc import AsyncIterable
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from itertools import chain, islice
 
 from dotenv import load_dotenv
 
@@ -85,6 +88,37 @@ load_dotenv()
 GRAPHITI_AVAILABLE = True  # Will be set based on MCP server availability
 
 
+# Phrases for explicit memory recall and for personal facts worth storing.
+# Each list is compiled into one alternation so a check is a single regex scan.
+_EXPLICIT_MEMORY_TRIGGER_RE = re.compile("|".join((
+    r"remember", r"what do you know about", r"do you remember", r"tell me about my",
+    r"recall", r"past conversation", r"previous", r"before", r"earlier"
+)), re.IGNORECASE)
+
+_MEMORY_WORTHY_RE = re.compile("|".join((
+    r"i am", r"i work", r"i like", r"i love", r"i hate", r"i prefer", r"i have", r"i own",
+    r"my name", r"my project", r"my company", r"my dog", r"my cat", r"my pet", r"my family",
+    r"i live", r"i study", r"i enjoy", r"i dislike", r"i need", r"i want"
+)), re.IGNORECASE)
+
+# Keyword extraction: stop words and a tokenizer that only yields words of 3+ characters
+_STOPWORDS = frozenset({
+    'i', 'me', 'my', 'you', 'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of',
+    'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'can', 'may', 'might', 'what', 'when', 'where', 'why', 'how',
+    'who', 'which', 'that', 'this', 'these', 'those'
+})
+_TOKEN_RE = re.compile(r'\w{3,}')
+
+async def _run_concurrently(*coros):
+    """Await independent coroutines together and return their results in order."""
+    if sys.version_info >= (3, 11):
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(coro) for coro in coros]
+        return [task.result() for task in tasks]
+    return await asyncio.gather(*coros)
+
+
 class DynamicAgent(Agent):
     """Agent that configures itself based on a preset and includes built-in tools with enhanced memory capabilities"""
     
@@ -167,6 +201,8 @@ class DynamicAgent(Agent):
             r'^(hi|hello|hey|ok|okay|yes|no|thanks|thank you)$',
             r'^(what|how|when|where|why|who)\s+(is|are|was|were)\s+(the|a|an)\s+\w+\?*$'  # Simple factual questions
         ]
+        # Keyword extraction is pure, so results can be reused across repeated inputs
+        self._kw_cache = functools.lru_cache(maxsize=512)(self._extract_search_keywords_impl)
 
     async def _combine_prompts(self, agent_prompt: str) -> str:
         """Combine global system prompt with agent-specific prompt"""
@@ -306,7 +342,9 @@ Memory System Guidelines:
             ]
             for method, url, body in candidates:
                 try:
-                    resp = requests.request(method, url, json=body, timeout=self.memory_search_timeout)
+                    resp = await asyncio.to_thread(
+                        requests.request, method, url, json=body, timeout=self.memory_search_timeout
+                    )
                 except Exception:
                     continue
                 if not resp.ok:
@@ -701,7 +739,7 @@ Just ask me naturally and I'll use the right tool to help you! For example:
         
         # Check Graphiti REST API connectivity
         try:
-            resp = requests.get(f"{self.GRAPHITI_API_URL}/healthcheck", timeout=3)
+            resp = await asyncio.to_thread(requests.get, f"{self.GRAPHITI_API_URL}/healthcheck", timeout=3)
             if resp.ok:
                 status_parts.append("✅ Graphiti REST API: Connected")
                 self.memory_api_available = True
@@ -762,55 +800,51 @@ Just ask me naturally and I'll use the right tool to help you! For example:
 
     def extract_search_keywords(self, user_input: str) -> List[str]:
         """Extract relevant keywords and concepts for memory search"""
-        # Common words to filter out
-        stop_words = {'i', 'me', 'my', 'you', 'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'can', 'may', 'might', 'what', 'when', 'where', 'why', 'how', 'who', 'which', 'that', 'this', 'these', 'those'}
+        # Cached per agent; the same utterance is often analysed several times per turn
+        return list(self._kw_cache(user_input))
+
+    @staticmethod
+    def _extract_search_keywords_impl(user_input: str) -> tuple:
+        """Uncached keyword extraction (pure function of the input text)"""
+        user_lower = user_input.lower()
         
-        # Extract words and filter out stop words
-        words = re.findall(r'\b\w+\b', user_input.lower())
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
+        # Extract words of 3+ characters and filter out stop words
+        keywords = [word for word in _TOKEN_RE.findall(user_lower) if word not in _STOPWORDS]
         
         # Also generate concept-based searches
         concepts = []
         
         # Detect question types and add relevant concepts
-        if any(word in user_input.lower() for word in ['food', 'eat', 'meal', 'diet', 'nutrition']):
+        if any(word in user_lower for word in ['food', 'eat', 'meal', 'diet', 'nutrition']):
             concepts.extend(['pet', 'dog', 'cat', 'animal', 'dietary', 'preferences'])
         
-        if any(word in user_input.lower() for word in ['recommend', 'suggest', 'advice', 'should', 'best']):
+        if any(word in user_lower for word in ['recommend', 'suggest', 'advice', 'should', 'best']):
             concepts.extend(['preferences', 'likes', 'dislikes', 'interests'])
             
-        if any(word in user_input.lower() for word in ['travel', 'trip', 'vacation', 'visit']):
+        if any(word in user_lower for word in ['travel', 'trip', 'vacation', 'visit']):
             concepts.extend(['location', 'places', 'destinations'])
             
-        if any(word in user_input.lower() for word in ['work', 'job', 'career', 'project']):
+        if any(word in user_lower for word in ['work', 'job', 'career', 'project']):
             concepts.extend(['work', 'profession', 'company', 'project'])
         
-        # Combine keywords and concepts, return unique items
-        all_terms = list(set(keywords + concepts))
-        return all_terms[:10]  # Limit to avoid too many searches
+        # Combine keywords and concepts, return unique items in first-seen order
+        return tuple(islice(dict.fromkeys(chain(keywords, concepts)), 10))  # Limit to avoid too many searches
 
     def is_explicit_memory_trigger(self, user_input: str) -> bool:
         """Check for explicit memory-related queries"""
-        triggers = [
-            r"remember", r"what do you know about", r"do you remember", r"tell me about my", 
-            r"recall", r"past conversation", r"previous", r"before", r"earlier"
-        ]
-        return any(re.search(trigger, user_input, re.IGNORECASE) for trigger in triggers)
+        return _EXPLICIT_MEMORY_TRIGGER_RE.search(user_input) is not None
 
     def is_memory_worthy(self, user_input: str) -> bool:
         """Determine if user input contains information worth storing"""
-        # Patterns that indicate personal information sharing
-        personal_patterns = [
-            r"i am", r"i work", r"i like", r"i love", r"i hate", r"i prefer", r"i have", r"i own",
-            r"my name", r"my project", r"my company", r"my dog", r"my cat", r"my pet", r"my family",
-            r"i live", r"i study", r"i enjoy", r"i dislike", r"i need", r"i want"
-        ]
-        
-        # Information that suggests facts about the user
-        return any(re.search(pattern, user_input, re.IGNORECASE) for pattern in personal_patterns)
+        # Phrases that indicate personal information sharing
+        return _MEMORY_WORTHY_RE.search(user_input) is not None
 
-    async def retrieve_contextual_memory(self, user_input: str) -> List[str]:
-        """Optimized memory retrieval with caching, parallel searches, and smart filtering"""
+    async def retrieve_contextual_memory(self, user_input: str, precomputed_keywords: Optional[List[str]] = None) -> List[str]:
+        """Optimized memory retrieval with caching, parallel searches, and smart filtering
+
+        Pass *precomputed_keywords* (from extract_search_keywords) when the
+        caller has already extracted them to skip a second extraction.
+        """
         start_time = time.time()
         
         # Early exit for queries that don't need memory
@@ -834,7 +868,7 @@ Just ask me naturally and I'll use the right tool to help you! For example:
         
         # Add strategic keyword searches only for relevant queries
         if not self.is_explicit_memory_trigger(user_input):
-            keywords = self.extract_search_keywords(user_input)
+            keywords = precomputed_keywords if precomputed_keywords is not None else self.extract_search_keywords(user_input)
             # Be more selective - only add top 2 keywords to reduce latency
             search_queries.extend(keywords[:2])
         else:
@@ -912,7 +946,7 @@ Just ask me naturally and I'll use the right tool to help you! For example:
             resp = None
             for url in endpoints:
                 try:
-                    r = requests.post(url, json=payload, timeout=5)
+                    r = await asyncio.to_thread(requests.post, url, json=payload, timeout=5)
                 except Exception:
                     continue
                 # Accept 200/201/202 as success
@@ -1258,9 +1292,18 @@ Just ask me naturally and I'll use the right tool to help you! For example:
             except Exception as e:
                 logger.error(f"Error processing fast response: {e}")
 
-        # Always attempt to retrieve relevant memories for context
+        # Always attempt to retrieve relevant memories for context. Storing
+        # memory-worthy input is independent of retrieval; both make their
+        # Graphiti requests on worker threads, so the round-trips overlap and
+        # the turn waits for the slower one only.
         logger.info(f"🧠 About to retrieve memories for: '{user_input[:50]}...'")
-        relevant_memories = await self.retrieve_contextual_memory(user_input)
+        if self.is_memory_worthy(user_input):
+            relevant_memories, _ = await _run_concurrently(
+                self.retrieve_contextual_memory(user_input),
+                self.store_memory(user_input, f"User Info - {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}"),
+            )
+        else:
+            relevant_memories = await self.retrieve_contextual_memory(user_input)
         logger.info(f"🧠 Retrieved {len(relevant_memories)} memories: {relevant_memories[:2] if relevant_memories else 'None'}")
         
         # Build enhanced system prompt with memory context
@@ -1285,10 +1328,6 @@ Just ask me naturally and I'll use the right tool to help you! For example:
         if hasattr(self, 'session') and hasattr(self.session, 'llm') and self.session.llm:
             self.session.llm.system_prompt = system_prompt
         
-        # Store memory if the input contains meaningful personal information
-        if self.is_memory_worthy(user_input):
-            await self.store_memory(user_input, f"User Info - {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}")
-        
         # Call parent implementation if it exists
         if hasattr(super(), 'on_user_turn_completed'):
             await super().on_user_turn_completed(turn_ctx, new_message)
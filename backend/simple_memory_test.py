@@ -7,12 +7,46 @@ without requiring full LiveKit setup.
 """
 
 import asyncio
+import re
 import sys
 import os
 
 # Add paths for imports
 sys.path.append(os.path.dirname(__file__))
 
+# Phrases that mark personal facts, matched anywhere in the input
+_PERSONAL_PATTERNS = [
+    r"i am", r"i work", r"i like", r"i love", r"i hate", r"i prefer", r"i have", r"i own",
+    r"my name", r"my project", r"my company", r"my dog", r"my cat", r"my pet", r"my family"
+]
+
+# The same phrases compiled into one alternation so a negative utterance is
+# scanned once instead of once per phrase. No word boundaries: plurals and
+# contractions ("my dogs", "I haven't") must keep matching.
+_PERSONAL_RE = re.compile(
+    r"i (?:am|work|like|love|hate|prefer|have|own)"
+    r"|my (?:name|project|company|dog|cat|pet|family)",
+    re.IGNORECASE,
+)
+
+def test_personal_re_matches_pattern_list():
+    """The compiled alternation agrees with searching each phrase in turn"""
+    samples = [
+        "my projects are late",
+        "my dogs bark",
+        "I haven't eaten",
+        "I'm tired",
+        "My names are hard to spell",
+        "I likewise agree",
+        "I own two cats",
+        "Tell me a joke",
+        "What is the weather?",
+    ]
+    for text in samples:
+        old = any(re.search(pattern, text, re.IGNORECASE) for pattern in _PERSONAL_PATTERNS)
+        new = _PERSONAL_RE.search(text) is not None
+        assert old == new, f"{text!r}: pattern list={old}, alternation={new}"
+
 async def test_memory_components():
     """Test the memory functionality components directly"""
     
@@ -22,7 +56,6 @@ async def test_memory_components():
     # Import just the memory-related functions we need
     try:
         # Test basic Python imports that don't require LiveKit
-        import re
         import time
         import requests
         from datetime import datetime
@@ -48,11 +81,7 @@ async def test_memory_components():
         
         def is_memory_worthy(user_input: str):
             """Test version of memory worthy detection"""
-            personal_patterns = [
-                r"i am", r"i work", r"i like", r"i love", r"i hate", r"i prefer", r"i have", r"i own",
-                r"my name", r"my project", r"my company", r"my dog", r"my cat", r"my pet", r"my family"
-            ]
-            return any(re.search(pattern, user_input, re.IGNORECASE) for pattern in personal_patterns)
+            return _PERSONAL_RE.search(user_input) is not None
         
         print("✅ Memory functions defined: OK")
         
@@ -112,6 +141,8 @@ async def test_memory_components():
 async def main():
     """Run simple memory test"""
     try:
+        test_personal_re_matches_pattern_list()
+        print("✅ Personal-fact regex matches the phrase list")
         success = await test_memory_components()
         if success:
             print("\n✅ Memory components are working correctly!")
@@ -1,22 +1,30 @@
 #!/usr/bin/env python3
 """
 Unified startup script for MCP API, Preset API, and LiveKit agent worker.
+
+Set COMBINED_API=true to serve all APIs from one process (start_combined.py)
+instead of one process per API.
 """
 import subprocess
 import sys
 import os
-import time
 import signal
+import threading
+
+# uvicorn logs this line once the server socket is bound
+READY_MARKER = "Uvicorn running on"
+READY_TIMEOUT = 20
 
 # Global process references for cleanup
 proc_mcp = None
 proc_preset = None
 proc_global_settings = None
 proc_auth = None
+proc_combined = None
 
 def cleanup_processes():
     """Clean up child processes on exit"""
-    global proc_mcp, proc_preset, proc_global_settings, proc_auth
+    global proc_mcp, proc_preset, proc_global_settings, proc_auth, proc_combined
     if proc_mcp:
         proc_mcp.terminate()
     if proc_preset:
@@ -25,6 +33,8 @@ def cleanup_processes():
         proc_global_settings.terminate()
     if proc_auth:
         proc_auth.terminate()
+    if proc_combined:
+        proc_combined.terminate()
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
@@ -36,35 +46,72 @@ def signal_handler(signum, frame):
 signal.signal(signal.SIGTERM, signal_handler)
 signal.signal(signal.SIGINT, signal_handler)
 
-try:
+def start_and_wait(args, name):
+    """Start *args* and block until it logs READY_MARKER, teeing its output.
+
+    The child's output keeps being forwarded after readiness so the pipe
+    never fills up and stalls the child.
+    """
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    proc = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True, env=env
+    )
+    ready = threading.Event()
+    started = threading.Event()
+
+    def _tee_output():
+        for line in proc.stdout:
+            sys.stdout.write(line)
+            if not ready.is_set() and READY_MARKER in line:
+                started.set()
+                ready.set()
+        ready.set()  # process exited; unblock the waiter
+
+    threading.Thread(target=_tee_output, name=f"{name}-output", daemon=True).start()
+
+    if not ready.wait(timeout=READY_TIMEOUT):
+        print(f"⚠️  {name} not ready after {READY_TIMEOUT}s, continuing anyway")
+    elif not started.is_set():
+        print(f"❌ {name} exited with code {proc.wait()}")
+    return proc
+
+
+def start_separate_apis():
+    """Start each API in its own process"""
+    global proc_mcp, proc_preset, proc_global_settings, proc_auth
+
     # 1. Start Authentication API Server
     print("🔐 Starting Authentication API server...")
-    proc_auth = subprocess.Popen([sys.executable, "start_simple_auth_server.py"])
+    proc_auth = start_and_wait([sys.executable, "start_simple_auth_server.py"], "Auth API")
     
-    # 2. Give Auth API a moment to initialize
-    time.sleep(2)
-    # 3. Start MCP API Server
+    # 2. Start MCP API Server
     print("🚀 Starting MCP API server...")
-    proc_mcp = subprocess.Popen([sys.executable, "api/start_mcp_api.py"])
-    
-    # 4. Give MCP API a moment to initialize
-    time.sleep(2)
+    proc_mcp = start_and_wait([sys.executable, "api/start_mcp_api.py"], "MCP API")
     
-    # 5. Start Preset API Server using dedicated script
+    # 3. Start Preset API Server using dedicated script
     print("🚀 Starting Preset API server...")
-    proc_preset = subprocess.Popen([sys.executable, "start_preset_server.py"])
-    
-    # 6. Give Preset API a moment to initialize
-    time.sleep(3)
+    proc_preset = start_and_wait([sys.executable, "start_preset_server.py"], "Preset API")
     
-    # 7. Start Global Settings API Server
+    # 4. Start Global Settings API Server
     print("🚀 Starting Global Settings API server...")
-    proc_global_settings = subprocess.Popen([sys.executable, "start_global_settings_api.py"])
-    
-    # 8. Give Global Settings API a moment to initialize
-    time.sleep(2)
+    proc_global_settings = start_and_wait([sys.executable, "start_global_settings_api.py"], "Global Settings API")
+
+
+def start_combined_api():
+    """Start all APIs mounted in a single process"""
+    global proc_combined
+
+    print("🚀 Starting Combined API server...")
+    proc_combined = start_and_wait([sys.executable, "start_combined.py"], "Combined API")
+
+
+try:
+    if os.getenv("COMBINED_API", "false").lower() in ("true", "1", "yes"):
+        start_combined_api()
+    else:
+        start_separate_apis()
     
-    # 9. Start LiveKit Agent Worker (this will block)
+    # 5. Start LiveKit Agent Worker (this will block)
     print("🚀 Starting LiveKit Dynamic Agent Worker...")
     subprocess.call([sys.executable, "core/dynamic_agent.py", "start"])
 
@@ -8,6 +8,7 @@ This is the standalone authentication server entry point for production deployme
 import uvicorn
 import os
 from start_simple_auth_server import create_app
+from utils.access_log import SampledLogger
 
 def main():
     """Main entry point for production authentication server"""
@@ -30,6 +31,7 @@ def main():
     print(f"✅ Admin account configured for: {admin_email}")
     
     app = create_app()
+    app.add_middleware(SampledLogger)
     
     uvicorn.run(
         app,
@@ -37,7 +39,7 @@ def main():
         port=port,
         reload=False,  # No reload in production
         log_level="info",
-        access_log=True
+        access_log=False  # sampled by SampledLogger instead
     )
 
 if __name__ == "__main__":
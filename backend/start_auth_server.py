@@ -9,8 +9,11 @@ import uvicorn
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from api.auth_api import router as auth_router
 from core.database import init_db
+from utils.access_log import SampledLogger
+from utils.cors import get_cors_origins
 
 
 def create_app() -> FastAPI:
@@ -18,13 +21,14 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Personal Agent Authentication API",
         description="Secure authentication service with TOTP and recovery codes",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=ORJSONResponse
     )
     
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["http://localhost:3000", "http://localhost:3001", "*"],  # Add your frontend URLs
+        allow_origins=get_cors_origins(),  # Set CORS_ORIGINS for your frontend URLs
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -60,11 +64,13 @@ if __name__ == "__main__":
     print(f"🌐 Server will be available at: http://{host}:{port}")
     
     app = create_app()
+    app.add_middleware(SampledLogger)
     
     uvicorn.run(
         app,
         host=host,
         port=port,
         reload=os.getenv("ENV") != "production",  # Disable reload in production
-        log_level="info"
+        log_level="info",
+        access_log=False
     )
\ No newline at end of file
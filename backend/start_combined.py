@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Combined API Server
+
+Serves the Auth, MCP, Preset and Global Settings APIs from a single uvicorn
+process instead of one interpreter per service. Each app is mounted under a
+path prefix:
+
+  /mcp       -> MCP API          (standalone port 8082)
+  /preset    -> Preset API       (standalone port 8083)
+  /settings  -> Global Settings  (standalone port 8084)
+  /          -> Auth API         (standalone port 8001, routes already under /auth)
+
+The per-port start scripts are still the default for local development.
+"""
+
+import os
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.mcp_api import app as mcp_app
+from api.preset_api import app as preset_app
+from api.global_settings_api import app as settings_app
+from start_simple_auth_server import create_app as create_auth_app
+from utils.access_log import SampledLogger
+
+
+def create_app() -> FastAPI:
+    """Create the parent app with every service mounted under its prefix"""
+    auth_app = create_auth_app()
+    sub_apps = (mcp_app, preset_app, settings_app, auth_app)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Mounted apps do not receive lifespan events from Starlette, so run
+        # each app's startup/shutdown handlers from the parent.
+        async with AsyncExitStack() as stack:
+            for sub_app in sub_apps:
+                await stack.enter_async_context(sub_app.router.lifespan_context(sub_app))
+            yield
+
+    app = FastAPI(
+        title="Personal Agent Combined API",
+        description="Auth, MCP, Preset and Global Settings APIs in one process",
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+    app.add_middleware(SampledLogger)
+
+    app.mount("/mcp", mcp_app)
+    app.mount("/preset", preset_app)
+    app.mount("/settings", settings_app)
+    # Auth routes carry their own /auth prefix; mounted last as the fallback
+    app.mount("/", auth_app)
+
+    return app
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("COMBINED_API_PORT", 8000))
+    host = os.getenv("COMBINED_API_HOST", "0.0.0.0")
+
+    print(f"🚀 Starting Combined API server on {host}:{port}")
+    uvicorn.run(
+        create_app(),
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=1,
+        reload=False,
+        log_level="info",
+        access_log=False
+    )
@@ -10,10 +10,12 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from api.global_settings_api import app
+from utils.access_log import SampledLogger
 
 if __name__ == "__main__":
     port = int(os.getenv("GLOBAL_SETTINGS_API_PORT", 8084))
     host = os.getenv("GLOBAL_SETTINGS_API_HOST", "0.0.0.0")
     
     print(f"🚀 Starting Global Settings API on {host}:{port}")
-    uvicorn.run(app, host=host, port=port, log_level="info") 
\ No newline at end of file
+    app.add_middleware(SampledLogger)
+    uvicorn.run(app, host=host, port=port, log_level="info", access_log=False) 
\ No newline at end of file
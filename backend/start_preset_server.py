@@ -11,17 +11,19 @@ sys.path.insert(0, '/app')
 def main():
     try:
         from api.preset_api import app
+        from utils.access_log import SampledLogger
         import uvicorn
         
         port = int(os.getenv("PRESET_API_PORT", "8083"))
         print(f"🚀 Starting Preset API server on port {port}...")
+        app.add_middleware(SampledLogger)
         
         uvicorn.run(
             app, 
             host="0.0.0.0", 
             port=port,
             reload=False,
-            access_log=True,
+            access_log=False,  # sampled by SampledLogger instead
             log_level="info"
         )
     except Exception as e:
@@ -8,20 +8,25 @@ import uvicorn
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from api.simple_auth_api import router as auth_router
+from utils.access_log import SampledLogger
+from utils.cors import get_cors_origins
+
 
 def create_app():
     """Create FastAPI application"""
     app = FastAPI(
         title="Personal Agent Simple Authentication API",
         description="Simplified authentication API for single admin user",
-        version="2.0.0"
+        version="2.0.0",
+        default_response_class=ORJSONResponse
     )
     
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],  # In production, specify your domain
+        allow_origins=get_cors_origins(),  # Set CORS_ORIGINS for your frontend URLs
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -78,11 +83,13 @@ if __name__ == "__main__":
     print("📚 API docs available at: http://localhost:8001/docs")
     
     app = create_app()
+    app.add_middleware(SampledLogger)
     
     uvicorn.run(
         app,
         host=host,
         port=port,
         reload=False,  # Disable reload in container environment
-        log_level="info"
+        log_level="info",
+        access_log=False
     )
\ No newline at end of file
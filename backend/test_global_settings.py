@@ -3,6 +3,7 @@
 Test script for Global Settings functionality
 """
 import asyncio
+import logging
 import sys
 import os
 
@@ -12,6 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from core.global_settings_manager import global_settings_manager, GlobalSettingsConfig
 from core.database import init_db
 
+logger = logging.getLogger("global-settings-test")
+
 async def test_global_settings():
     """Test the global settings functionality"""
     print("🧪 Testing Global Settings functionality...")
@@ -30,12 +33,12 @@ async def test_global_settings():
         success = await global_settings_manager.update_global_system_prompt(test_prompt, True)
         print(f"✅ Update global prompt: {'success' if success else 'failed'}")
         
-        # Test 3: Get updated settings
-        updated_settings = await global_settings_manager.get_global_settings()
+        # Tests 3 & 4: Get updated settings and global prompt (independent reads, run together)
+        updated_settings, prompt = await asyncio.gather(
+            global_settings_manager.get_global_settings(),
+            global_settings_manager.get_global_system_prompt(),
+        )
         print(f"✅ Updated settings: enabled={updated_settings.enabled}, prompt_length={len(updated_settings.global_system_prompt or '')}")
-        
-        # Test 4: Get global prompt
-        prompt = await global_settings_manager.get_global_system_prompt()
         print(f"✅ Global prompt retrieved: {prompt[:50]}..." if prompt else "✅ No global prompt set")
         
         # Test 5: Disable global prompt
@@ -49,9 +52,7 @@ async def test_global_settings():
         print("\n🎉 All tests passed!")
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Test failed: %s", e)
 
 if __name__ == "__main__":
     asyncio.run(test_global_settings()) 
\ No newline at end of file
@@ -7,6 +7,7 @@ and new features like caching, filtering, and parallel searches.
 """
 
 import asyncio
+import logging
 import time
 import sys
 import os
@@ -14,30 +15,40 @@ import os
 # Add paths for imports
 sys.path.append(os.path.dirname(__file__))
 
+# Imported at module scope so the import cost stays out of the timed calls below
+try:
+    from core.dynamic_agent import DynamicAgent
+    from core.agent_config import AgentPresetConfig, VoiceConfig, LLMConfig, STTConfig, AgentConfig
+    _IMPORT_ERROR = None
+except ImportError as e:
+    _IMPORT_ERROR = e
+
+logger = logging.getLogger("memory-optimization-test")
+
+def create_test_preset():
+    return AgentPresetConfig(
+        id="test-optimized-agent",
+        name="Optimized Memory Agent",
+        description="Testing optimized memory system",
+        system_prompt="You are a helpful assistant with optimized memory.",
+        voice_config=VoiceConfig(provider="openai", voice="ash"),
+        llm_config=LLMConfig(model="gpt-4o-mini", temperature=0.7),
+        stt_config=STTConfig(provider="deepgram", model="nova-3"),
+        agent_config=AgentConfig(allow_interruptions=True),
+        mcp_server_ids=[]
+    )
+
 async def test_memory_optimizations():
     """Test the optimized memory system"""
     
     print("⚡ Memory Optimization Test")
     print("=" * 50)
     
-    # Import with optimizations
+    if _IMPORT_ERROR is not None:
+        print(f"❌ Imports failed: {_IMPORT_ERROR}")
+        return False
+    
     try:
-        from core.dynamic_agent import DynamicAgent
-        from core.agent_config import AgentPresetConfig, VoiceConfig, LLMConfig, STTConfig, AgentConfig
-        
-        def create_test_preset():
-            return AgentPresetConfig(
-                id="test-optimized-agent",
-                name="Optimized Memory Agent",
-                description="Testing optimized memory system",
-                system_prompt="You are a helpful assistant with optimized memory.",
-                voice_config=VoiceConfig(provider="openai", voice="ash"),
-                llm_config=LLMConfig(model="gpt-4o-mini", temperature=0.7),
-                stt_config=STTConfig(provider="deepgram", model="nova-3"),
-                agent_config=AgentConfig(allow_interruptions=True),
-                mcp_server_ids=[]
-            )
-        
         print("✅ Imports successful")
         
         # Create optimized agent
@@ -154,9 +165,7 @@ async def test_memory_optimizations():
         return True
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Test failed: %s", e)
         return False
 
 async def main():
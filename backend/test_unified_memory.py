@@ -10,7 +10,9 @@ import asyncio
 import logging
 import sys
 import os
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
 
 # Add the backend directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__)))
@@ -22,25 +24,25 @@ from core.agent_config import AgentPresetConfig, VoiceConfig, LLMConfig, STTConf
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("unified-memory-test")
 
-class MockSession:
-    """Mock session for testing"""
-    def __init__(self):
-        self.llm = MockLLM()
-        self.room = None
-
+@dataclass(slots=True)
 class MockLLM:
     """Mock LLM for testing"""
-    def __init__(self):
-        self.system_prompt = ""
+    system_prompt: str = ""
+
+@dataclass(slots=True)
+class MockSession:
+    """Mock session for testing"""
+    llm: MockLLM = field(default_factory=MockLLM)
+    room: Any = None
 
+@dataclass(slots=True)
 class MockMessage:
     """Mock message for testing"""
-    def __init__(self, text_content: str):
-        self.text_content = text_content
+    text_content: str
 
+@dataclass(slots=True)
 class MockChatContext:
     """Mock chat context for testing"""
-    pass
 
 def create_test_preset():
     """Create a test preset for the DynamicAgent"""
@@ -99,7 +101,7 @@ async def test_unified_memory_functionality():
     print(f"Extracted keywords: {keywords}")
     
     # Test memory retrieval
-    memories = await agent.retrieve_contextual_memory(dog_food_question)
+    memories = await agent.retrieve_contextual_memory(dog_food_question, precomputed_keywords=keywords)
     print(f"Retrieved memories: {len(memories)}")
     
     if memories:
@@ -9,19 +9,32 @@ to the new PostgreSQL database storage system.
 import os
 import sys
 import asyncio
+import functools
 from pathlib import Path
 
-# Add the current directory to Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Use uvloop's faster event loop when it is installed
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
-from database import init_db, health_check, create_tables_sync
-from db_manager import db_manager
+# Run as `python -m tests.<name>` from backend/ to use the normal import path;
+# when run as a file, add the backend root once instead
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database modules are imported inside each command so `--help`/unknown
+# commands return without paying for SQLAlchemy and the DB engine setup
 
 
 async def migrate_from_json(json_file_path: str):
     """Migrate data from JSON file to database"""
     print(f"🔄 Starting migration from {json_file_path}")
     
+    from core.database import init_db, health_check
+    from core.db_manager import db_manager
+    
     # Check if JSON file exists
     if not os.path.exists(json_file_path):
         print(f"❌ JSON file not found: {json_file_path}")
@@ -61,13 +74,12 @@ async def migrate_from_json(json_file_path: str):
         return False
 
 
-async def create_default_servers():
-    """Create default server configurations in database"""
-    print("🔄 Creating default server configurations...")
-    
-    from mcp_config_db import MCPServerConfig, MCPServerType, AuthType, AuthConfig
+@functools.lru_cache(maxsize=1)
+def _default_servers():
+    """Build the default server configurations once; later calls reuse the tuple"""
+    from config.mcp_config_db import MCPServerConfig, MCPServerType, AuthType, AuthConfig
     
-    default_servers = [
+    return (
         MCPServerConfig(
             id="example-sse",
             name="Example SSE Server",
@@ -98,15 +110,24 @@ async def create_default_servers():
             ),
             enabled=False
         )
-    ]
+    )
+
+
+async def create_default_servers():
+    """Create default server configurations in database"""
+    print("🔄 Creating default server configurations...")
+    
+    from core.db_manager import db_manager
+    default_servers = _default_servers()
     
     try:
+        # One bulk upsert instead of a round-trip per server
+        if not await db_manager.save_servers_bulk(default_servers):
+            print("❌ Failed to create default servers")
+            return False
+        
         for config in default_servers:
-            success = await db_manager.save_server(config)
-            if success:
-                print(f"✅ Created server: {config.id}")
-            else:
-                print(f"❌ Failed to create server: {config.id}")
+            print(f"✅ Created server: {config.id}")
         
         return True
     except Exception as e:
@@ -118,6 +139,9 @@ async def verify_database():
     """Verify database setup and connectivity"""
     print("🔍 Verifying database setup...")
     
+    from core.database import init_db, health_check
+    from core.db_manager import db_manager
+    
     try:
         # Initialize database
         await init_db()
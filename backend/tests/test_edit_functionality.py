@@ -5,139 +5,196 @@ Test script for MCP edit functionality
 This script tests that the edit functionality works correctly by:
 1. Fetching server details
 2. Modifying the configuration 
-3. Updating the server
-4. Verifying the changes
+3. Updating the server with a PATCH of the changed fields
+4. Verifying the changes from the PATCH response
 """
 
 import asyncio
 import aiohttp
-import json
+import orjson
 import sys
+from typing import Any, Dict, List, Optional
 
-API_BASE = "http://localhost:8082"
+from pydantic import BaseModel
+
+# Use uvloop's faster event loop when it is installed
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# 127.0.0.1 rather than localhost: skips name resolution and any ::1 attempt
+API_BASE = "http://127.0.0.1:8082"
 TEST_SERVER_ID = "example-sse"
+MERGE_PATCH_HEADERS = {'Content-Type': 'application/merge-patch+json'}
 
-async def test_edit_functionality():
-    """Test the complete edit workflow"""
-    async with aiohttp.ClientSession() as session:
-        print("🧪 Testing MCP Server Edit Functionality...")
-        print("=" * 50)
-        
-        # Step 1: Fetch original server details
-        print(f"📥 1. Fetching server details for '{TEST_SERVER_ID}'...")
-        try:
-            async with session.get(f"{API_BASE}/servers/{TEST_SERVER_ID}") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    original_config = data['data']['config']
-                    print(f"   ✅ Original name: '{original_config['name']}'")
-                    print(f"   ✅ Original description: '{original_config['description']}'")
-                    print(f"   ✅ Original enabled: {original_config['enabled']}")
-                else:
-                    print(f"   ❌ Failed to fetch server: {response.status}")
-                    return False
-        except Exception as e:
-            print(f"   ❌ Error fetching server: {e}")
-            return False
-        
-        # Step 2: Prepare updated configuration
-        print(f"\n📝 2. Preparing updated configuration...")
-        updated_config = original_config.copy()
-        updated_config['name'] = "Updated Test Server"
-        updated_config['description'] = "This server was updated via API test"
-        updated_config['enabled'] = not original_config['enabled']  # Toggle enabled state
-        
-        print(f"   ✅ New name: '{updated_config['name']}'")
-        print(f"   ✅ New description: '{updated_config['description']}'")
-        print(f"   ✅ New enabled: {updated_config['enabled']}")
-        
-        # Step 3: Update the server via PUT request
-        print(f"\n📤 3. Updating server configuration...")
-        try:
-            headers = {'Content-Type': 'application/json'}
-            async with session.put(
-                f"{API_BASE}/servers/{TEST_SERVER_ID}", 
-                data=json.dumps(updated_config),
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    print(f"   ✅ Update successful: {result['message']}")
-                else:
-                    print(f"   ❌ Update failed: {response.status}")
-                    error_text = await response.text()
-                    print(f"   ❌ Error: {error_text}")
-                    return False
-        except Exception as e:
-            print(f"   ❌ Error updating server: {e}")
-            return False
-        
-        # Step 4: Verify the changes were applied
-        print(f"\n🔍 4. Verifying changes were applied...")
-        try:
-            async with session.get(f"{API_BASE}/servers/{TEST_SERVER_ID}") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    verified_config = data['data']['config']
-                    
-                    # Check if changes were applied
-                    name_correct = verified_config['name'] == updated_config['name']
-                    desc_correct = verified_config['description'] == updated_config['description']
-                    enabled_correct = verified_config['enabled'] == updated_config['enabled']
-                    
-                    print(f"   ✅ Name updated: {name_correct} ('{verified_config['name']}')")
-                    print(f"   ✅ Description updated: {desc_correct}")
-                    print(f"   ✅ Enabled state updated: {enabled_correct} ({verified_config['enabled']})")
-                    
-                    if name_correct and desc_correct and enabled_correct:
-                        print(f"\n🎉 All changes verified successfully!")
-                    else:
-                        print(f"\n❌ Some changes were not applied correctly!")
-                        return False
-                else:
-                    print(f"   ❌ Failed to verify changes: {response.status}")
-                    return False
-        except Exception as e:
-            print(f"   ❌ Error verifying changes: {e}")
-            return False
-        
-        # Step 5: Restore original configuration 
-        print(f"\n🔄 5. Restoring original configuration...")
-        try:
-            headers = {'Content-Type': 'application/json'}
-            async with session.put(
-                f"{API_BASE}/servers/{TEST_SERVER_ID}", 
-                data=json.dumps(original_config),
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    print(f"   ✅ Original configuration restored")
-                else:
-                    print(f"   ⚠️  Warning: Failed to restore original config: {response.status}")
-        except Exception as e:
-            print(f"   ⚠️  Warning: Error restoring original config: {e}")
-        
-        return True
 
-async def main():
-    """Main test function"""
-    print("🔧 MCP Edit Functionality Test")
+class ServerConfig(BaseModel):
+    """Server config as exchanged with the MCP API (mirrors MCPServerConfigAPI)"""
+    id: str
+    name: str
+    description: str
+    server_type: str
+    url: Optional[str] = None
+    command: Optional[str] = None
+    args: Optional[List[str]] = None
+    env: Optional[Dict[str, str]] = None
+    auth: Optional[Dict[str, Any]] = None
+    enabled: bool = True
+    timeout: float = 5.0
+    sse_read_timeout: float = 300.0
+    retry_count: int = 3
+    health_check_interval: int = 60
+
+
+class _ServerData(BaseModel):
+    config: ServerConfig
+
+
+class _ServerResponse(BaseModel):
+    """Envelope of GET /servers/{id}; other fields are ignored while decoding"""
+    data: _ServerData
+
+
+class _PatchResponse(BaseModel):
+    """Envelope of PATCH /servers/{id}; data is the stored config after the merge"""
+    data: ServerConfig
+
+
+_decode_server = _ServerResponse.model_validate_json
+_decode_patch = _PatchResponse.model_validate_json
+_encode = orjson.dumps
+
+async def test_edit_functionality(session: aiohttp.ClientSession):
+    """Test the complete edit workflow"""
+    print("🧪 Testing MCP Server Edit Functionality...")
     print("=" * 50)
     
-    # Test if server is running
+    # Step 1: Fetch original server details
+    print(f"📥 1. Fetching server details for '{TEST_SERVER_ID}'...")
+    try:
+        async with session.get(f"{API_BASE}/servers/{TEST_SERVER_ID}") as response:
+            if response.status == 200:
+                # Decode straight from bytes into the typed config
+                original_config = _decode_server(await response.read()).data.config
+                print(f"   ✅ Original name: '{original_config.name}'")
+                print(f"   ✅ Original description: '{original_config.description}'")
+                print(f"   ✅ Original enabled: {original_config.enabled}")
+            else:
+                print(f"   ❌ Failed to fetch server: {response.status}")
+                return False
+    except Exception as e:
+        print(f"   ❌ Error fetching server: {e}")
+        return False
+    
+    # Step 2: Prepare updated configuration
+    print(f"\n📝 2. Preparing updated configuration...")
+    updated_config = original_config.model_copy(update={
+        "name": "Updated Test Server",
+        "description": "This server was updated via API test",
+        "enabled": not original_config.enabled  # Toggle enabled state
+    })
+    
+    print(f"   ✅ New name: '{updated_config.name}'")
+    print(f"   ✅ New description: '{updated_config.description}'")
+    print(f"   ✅ New enabled: {updated_config.enabled}")
+    
+    # Step 3: Update the server via PATCH, sending only the changed fields
+    print(f"\n📤 3. Updating server configuration...")
+    try:
+        async with session.patch(
+            f"{API_BASE}/servers/{TEST_SERVER_ID}",
+            data=_encode({
+                "name": updated_config.name,
+                "description": updated_config.description,
+                "enabled": updated_config.enabled
+            }),
+            headers=MERGE_PATCH_HEADERS
+        ) as response:
+            if response.status == 200:
+                # The response carries the stored config, so no extra GET is needed to verify
+                verified_config = _decode_patch(await response.read()).data
+                print("   ✅ Update successful")
+            else:
+                print(f"   ❌ Update failed: {response.status}")
+                error_text = await response.text()
+                print(f"   ❌ Error: {error_text}")
+                return False
+    except Exception as e:
+        print(f"   ❌ Error updating server: {e}")
+        return False
+    
+    # Step 4: Verify the changes were applied
+    print(f"\n🔍 4. Verifying changes were applied...")
+    name_correct = verified_config.name == updated_config.name
+    desc_correct = verified_config.description == updated_config.description
+    enabled_correct = verified_config.enabled == updated_config.enabled
+    
+    print(f"   ✅ Name updated: {name_correct} ('{verified_config.name}')")
+    print(f"   ✅ Description updated: {desc_correct}")
+    print(f"   ✅ Enabled state updated: {enabled_correct} ({verified_config.enabled})")
+    
+    if name_correct and desc_correct and enabled_correct:
+        print(f"\n🎉 All changes verified successfully!")
+    else:
+        print(f"\n❌ Some changes were not applied correctly!")
+        return False
+    
+    # Step 5: Restore original configuration (only the fields that were changed)
+    print(f"\n🔄 5. Restoring original configuration...")
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{API_BASE}/health", timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status != 200:
-                    print("❌ MCP API server is not responding.")
-                    return 1
+        async with session.patch(
+            f"{API_BASE}/servers/{TEST_SERVER_ID}",
+            data=_encode({
+                "name": original_config.name,
+                "description": original_config.description,
+                "enabled": original_config.enabled
+            }),
+            headers=MERGE_PATCH_HEADERS
+        ) as response:
+            await response.read()
+            if response.status == 200:
+                print(f"   ✅ Original configuration restored")
+            else:
+                print(f"   ⚠️  Warning: Failed to restore original config: {response.status}")
+    except Exception as e:
+        print(f"   ⚠️  Warning: Error restoring original config: {e}")
+    
+    return True
+
+async def _probe_health(session: aiohttp.ClientSession) -> bool:
+    """Pre-flight check that the server is up, on the same session as the tests"""
+    try:
+        async with session.get(f"{API_BASE}/health") as response:
+            await response.read()
+            if response.status == 200:
+                return True
+            print("❌ MCP API server is not responding.")
+            return False
     except Exception as e:
         print("❌ MCP API server is not running.")
         print(f"   Error: {e}")
-        return 1
+        return False
+
+async def main():
+    """Main test function"""
+    print("🔧 MCP Edit Functionality Test")
+    print("=" * 50)
     
-    # Run edit functionality test
-    success = await test_edit_functionality()
+    # One keep-alive session for the health check and every test request
+    async with aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=5),
+        connector=aiohttp.TCPConnector(
+            limit=10, keepalive_timeout=30, use_dns_cache=True, ttl_dns_cache=300
+        ),
+        trust_env=False  # No proxy/netrc lookups for a local server
+    ) as session:
+        if not await _probe_health(session):
+            return 1
+        
+        # Run edit functionality test
+        success = await test_edit_functionality(session)
     
     if success:
         print("\n🎉 Edit functionality test passed!")
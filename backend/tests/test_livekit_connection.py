@@ -5,14 +5,28 @@ Test LiveKit connection with generated token
 
 import asyncio
 import websockets
-import json
+import orjson
 import sys
 import os
 
-# Add the backend directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+# Use uvloop's faster event loop when it is installed
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
-from generate_token import generate_livekit_token
+# Run as `python -m tests.<name>` from backend/ to use the normal import path;
+# when run as a file, add the backend root once instead
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.generate_token import generate_livekit_token
+
+# Ping payload, encoded once; decoded so it is still sent as a text frame
+PING_MESSAGE = orjson.dumps({"type": "ping"}).decode()
+# Fail fast instead of hanging if the server never answers the ping
+RECV_TIMEOUT = 3.0
 
 async def test_livekit_connection():
     """Test LiveKit WebSocket connection"""
@@ -28,20 +42,21 @@ async def test_livekit_connection():
     try:
         print(f"Connecting to: {ws_url}")
         
-        async with websockets.connect(ws_url) as websocket:
+        # Payloads are tiny, so skip per-message deflate and cap the frame size
+        async with websockets.connect(ws_url, max_size=2**16, compression=None) as websocket:
             print("✅ Successfully connected to LiveKit!")
             
             # Send a simple message
-            message = {
-                "type": "ping"
-            }
-            await websocket.send(json.dumps(message))
+            await websocket.send(PING_MESSAGE)
             print("✅ Sent ping message")
             
             # Wait for response
-            response = await websocket.recv()
+            response = await asyncio.wait_for(websocket.recv(), timeout=RECV_TIMEOUT)
             print(f"✅ Received response: {response}")
             
+    except asyncio.TimeoutError:
+        print(f"❌ No response within {RECV_TIMEOUT}s")
+        return False
     except Exception as e:
         print(f"❌ Connection failed: {e}")
         return False
@@ -7,13 +7,23 @@ as expected for natural conversation scenarios.
 """
 
 import asyncio
+import functools
 import logging
 import sys
 import os
 from datetime import datetime
 
-# Add the backend directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+# Use uvloop's faster event loop when it is installed
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Run as `python -m tests.<name>` from backend/ to use the normal import path;
+# when run as a file, add the backend root once instead
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.dynamic_agent import DynamicAgent
 from core.agent_config import AgentPresetConfig, VoiceConfig, LLMConfig, STTConfig, AgentConfig
@@ -42,6 +52,7 @@ class MockChatContext:
     """Mock chat context for testing"""
     pass
 
+@functools.lru_cache(maxsize=1)
 def create_test_preset():
     """Create a test preset for the DynamicAgent"""
     return AgentPresetConfig(
@@ -56,6 +67,13 @@ def create_test_preset():
         mcp_server_ids=[]
     )
 
+@functools.lru_cache(maxsize=1)
+def _build_test_agent():
+    """Build the DynamicAgent once; every test shares it"""
+    agent = DynamicAgent(create_test_preset())
+    agent.session = MockSession()
+    return agent
+
 async def test_memory_scenarios():
     """Test various memory scenarios to validate enhanced functionality"""
     
@@ -63,9 +81,7 @@ async def test_memory_scenarios():
     print("=" * 50)
     
     # Initialize the enhanced agent
-    preset = create_test_preset()
-    agent = DynamicAgent(preset)
-    agent.session = MockSession()
+    agent = _build_test_agent()
     
     # Test scenarios that should trigger memory storage
     print("\n📝 Testing Memory Storage Scenarios")
@@ -79,13 +95,21 @@ async def test_memory_scenarios():
         "I live in San Francisco and I love hiking"
     ]
     
-    for scenario in storage_scenarios:
+    # Bound methods looked up once instead of on every loop iteration
+    memory_worthy = agent.is_memory_worthy
+    store = agent.store_memory
+    extract = agent.extract_search_keywords
+    retrieve = agent.retrieve_contextual_memory
+    
+    # One timestamp for the whole batch; the index keeps episode names distinct
+    ts = datetime.now().strftime('%H:%M:%S')
+    for i, scenario in enumerate(storage_scenarios, 1):
         print(f"Input: {scenario}")
-        is_worthy = agent.is_memory_worthy(scenario)
+        is_worthy = memory_worthy(scenario)
         print(f"Memory worthy: {is_worthy}")
         
         if is_worthy:
-            await agent.store_memory(scenario, f"Test Memory - {datetime.now().strftime('%H:%M:%S')}")
+            await store(scenario, f"Test Memory {i} - {ts}")
         print()
     
     # Wait a moment for storage to complete
@@ -109,11 +133,11 @@ async def test_memory_scenarios():
         print(f"Query: {scenario}")
         
         # Test keyword extraction
-        keywords = agent.extract_search_keywords(scenario)
+        keywords = extract(scenario)
         print(f"Extracted keywords: {keywords[:5]}")  # Show first 5
         
         # Test memory retrieval
-        memories = await agent.retrieve_contextual_memory(scenario)
+        memories = await retrieve(scenario, precomputed_keywords=keywords)
         print(f"Retrieved memories: {len(memories)}")
         
         if memories:
@@ -131,8 +155,7 @@ async def test_keyword_extraction():
     print("\n🔤 Testing Keyword Extraction")
     print("-" * 30)
     
-    preset = create_test_preset()
-    agent = DynamicAgent(preset)
+    agent = _build_test_agent()
     
     test_cases = [
         "What kind of dog food should I get?",
@@ -153,8 +176,7 @@ async def test_memory_triggers():
     print("\n🎯 Testing Memory Triggers")
     print("-" * 30)
     
-    preset = create_test_preset()
-    agent = DynamicAgent(preset)
+    agent = _build_test_agent()
     
     # Test explicit memory triggers
     explicit_triggers = [
@@ -199,9 +221,13 @@ async def test_memory_triggers():
 async def main():
     """Run all memory tests"""
     try:
-        await test_keyword_extraction()
-        await test_memory_triggers()
-        await test_memory_scenarios()
+        # Tasks start in argument order and the first two never await,
+        # so the printed output keeps the same order as running them sequentially
+        await asyncio.gather(
+            test_keyword_extraction(),
+            test_memory_triggers(),
+            test_memory_scenarios()
+        )
     except Exception as e:
         logger.error(f"Test failed: {e}")
         raise
@@ -0,0 +1,74 @@
+"""Sampled, off-thread access logging for the FastAPI services.
+
+uvicorn's built-in access log formats and writes a line for every request on
+the event loop thread. ``SampledLogger`` only emits every *N*-th request and
+hands the encoded line to a daemon thread that does the actual stderr write.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+
+import orjson
+from starlette.middleware.base import BaseHTTPMiddleware
+
+_DEFAULT_SAMPLE_RATE = int(os.getenv("ACCESS_LOG_SAMPLE_RATE", "100"))
+
+_QUEUE: "queue.Queue[bytes]" = queue.Queue()
+_WRITER: threading.Thread | None = None
+_WRITER_LOCK = threading.Lock()
+
+
+def _drain() -> None:
+    """Write queued log lines to stderr forever (daemon thread body)."""
+    out = sys.stderr.buffer
+    while True:
+        line = _QUEUE.get()
+        try:
+            out.write(line)
+            out.flush()
+        except Exception:
+            pass
+
+
+def _ensure_writer() -> None:
+    global _WRITER
+    if _WRITER is not None:
+        return
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = threading.Thread(target=_drain, name="access-log-writer", daemon=True)
+            _WRITER.start()
+
+
+class SampledLogger(BaseHTTPMiddleware):
+    """Log one JSON access line every ``sample_rate`` requests."""
+
+    def __init__(self, app, sample_rate: int = _DEFAULT_SAMPLE_RATE):
+        super().__init__(app)
+        self.sample_rate = max(1, sample_rate)
+        self._counter = itertools.count(1)
+        _ensure_writer()
+
+    async def dispatch(self, request, call_next):
+        count = next(self._counter)
+        if count % self.sample_rate:
+            return await call_next(request)
+
+        start = time.perf_counter()
+        response = await call_next(request)
+        _QUEUE.put_nowait(orjson.dumps({
+            "ts": time.time(),
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            "sampled": count,
+            "sample_rate": self.sample_rate,
+        }) + b"\n")
+        return response
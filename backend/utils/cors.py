@@ -0,0 +1,14 @@
+"""CORS settings shared by the API server entrypoints."""
+
+import os
+
+DEFAULT_CORS_ORIGINS = "http://localhost:3000,http://localhost:3001,http://localhost:5173,http://localhost:8080"
+
+
+def get_cors_origins():
+    """Explicit CORS origins from the comma-separated CORS_ORIGINS variable.
+
+    A wildcard origin is invalid together with credentials, so "*" is dropped.
+    """
+    origins = os.getenv("CORS_ORIGINS", DEFAULT_CORS_ORIGINS).split(",")
+    return [origin.strip() for origin in origins if origin.strip() and origin.strip() != "*"]
@@ -5,15 +5,24 @@ LiveKit Token Generator for Development
 This script generates proper JWT tokens for connecting to the LiveKit dev server.
 """
 
-import jwt
+import os
+import sys
 import time
 import uuid
-from datetime import datetime, timedelta
+import secrets
+
+# Allow running as a script (python utils/<name>.py) as well as importing
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.livekit_jwt import make_hs256_signer, video_grant
 
 # LiveKit dev server configuration
 LIVEKIT_API_KEY = "devkey"
 LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "your_secret_key_at_least_32_characters_long")
 
+_encode_hs256 = make_hs256_signer(LIVEKIT_API_SECRET)
+
 def generate_livekit_token(room_name: str = None, participant_name: str = None, duration_hours: int = 24):
     """
     Generate a LiveKit JWT token for development.
@@ -27,35 +36,30 @@ def generate_livekit_token(room_name: str = None, participant_name: str = None,
         JWT token string
     """
     
+    now_ts = int(time.time())
+    
     # Generate defaults if not provided
     if not room_name:
-        room_name = f"voice-assistant-{int(time.time())}"
+        room_name = f"voice-assistant-{now_ts}"
     
     if not participant_name:
-        participant_name = f"user-{uuid.uuid4().hex[:8]}"
+        participant_name = f"user-{secrets.token_hex(4)}"
     
     # Token payload
-    now = datetime.utcnow()
-    exp = now + timedelta(hours=duration_hours)
+    exp_ts = now_ts + duration_hours * 3600
     
     payload = {
         "iss": LIVEKIT_API_KEY,
         "sub": LIVEKIT_API_KEY,
         "jti": str(uuid.uuid4()),
-        "nbf": int(now.timestamp()),
-        "exp": int(exp.timestamp()),
-        "video": {
-            "room": room_name,
-            "roomJoin": True,
-            "canPublish": True,
-            "canSubscribe": True,
-            "canPublishData": True
-        },
+        "nbf": now_ts,
+        "exp": exp_ts,
+        "video": video_grant(room_name),
         "metadata": f"participant_name:{participant_name}"
     }
     
     # Generate JWT token
-    token = jwt.encode(payload, LIVEKIT_API_SECRET, algorithm="HS256")
+    token = _encode_hs256(payload)
     
     return token, room_name, participant_name
 
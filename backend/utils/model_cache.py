@@ -4,26 +4,109 @@ from __future__ import annotations
 
 import asyncio
 import httpx
+import logging
 import time
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Set, Tuple
 
+logger = logging.getLogger("model-cache")
+
+# Model id lists, keyed by provider
 _CACHE: Dict[str, Tuple[float, List[str]]] = {}
+# Full provider catalogs (model id -> model info), keyed by provider
+_CATALOG_CACHE: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+# Fetches in progress, so concurrent cold callers share one request; one
+# table per cache so a provider's list and catalog fetches never collide
+_INFLIGHT: Dict[str, asyncio.Future] = {}
+_CATALOG_INFLIGHT: Dict[str, asyncio.Future] = {}
+# Strong references to background refreshes so they aren't garbage collected
+_REFRESH_TASKS: Set[asyncio.Task] = set()
 _DEFAULT_TTL = 60 * 60  # 1 hour
+_DEFAULT_STALE_TTL = 2 * 60 * 60  # serve stale (while refreshing) up to 2 hours
 
 
-async def get_models(provider: str, fetch_fn, ttl: int = _DEFAULT_TTL) -> List[str]:
+async def get_models(
+    provider: str,
+    fetch_fn,
+    ttl: int = _DEFAULT_TTL,
+    stale_ttl: int = _DEFAULT_STALE_TTL,
+) -> List[str]:
     """Return cached models for provider or fetch using *fetch_fn*.
 
-    fetch_fn must be an async callable returning List[str].
+    fetch_fn must be an async callable returning List[str]. Entries older than
+    *ttl* but younger than *stale_ttl* are returned immediately while a
+    background task refreshes them.
     """
+    return await _get_cached(_CACHE, _INFLIGHT, provider, fetch_fn, ttl, stale_ttl)
+
+
+async def get_catalog(
+    provider: str,
+    fetch_fn,
+    ttl: int = _DEFAULT_TTL,
+    stale_ttl: int = _DEFAULT_STALE_TTL,
+) -> Dict[str, dict]:
+    """Return the cached model catalog for provider or fetch using *fetch_fn*.
+
+    Same caching rules as get_models, but fetch_fn returns a dict of model
+    info keyed by model id and the result is kept apart from the id lists.
+    """
+    return await _get_cached(_CATALOG_CACHE, _CATALOG_INFLIGHT, provider, fetch_fn, ttl, stale_ttl)
+
+
+async def _get_cached(
+    cache: Dict[str, Tuple[float, Any]],
+    inflight: Dict[str, asyncio.Future],
+    provider: str,
+    fetch_fn,
+    ttl: int,
+    stale_ttl: int,
+) -> Any:
+    """Serve *provider* from *cache*, refreshing or fetching as its age requires."""
     now = time.time()
-    # Return cached if fresh
-    if provider in _CACHE:
-        ts, models = _CACHE[provider]
-        if now - ts < ttl:
-            return models
-
-    # Fetch and cache
-    models = await fetch_fn()
-    _CACHE[provider] = (now, models)
-    return models 
\ No newline at end of file
+    if provider in cache:
+        ts, value = cache[provider]
+        age = now - ts
+        # Return cached if fresh
+        if age < ttl:
+            return value
+        # Stale but usable: refresh in the background, answer from cache
+        if age < stale_ttl:
+            if provider not in inflight:
+                task = asyncio.create_task(_refresh(cache, inflight, provider, fetch_fn))
+                _REFRESH_TASKS.add(task)
+                task.add_done_callback(_REFRESH_TASKS.discard)
+            return value
+
+    return await _fetch(cache, inflight, provider, fetch_fn)
+
+
+async def _refresh(cache, inflight, provider: str, fetch_fn) -> None:
+    """Background refresh; failures keep the stale entry in place."""
+    try:
+        await _fetch(cache, inflight, provider, fetch_fn)
+    except Exception as e:
+        logger.warning(f"Background refresh of {provider} models failed: {e}")
+
+
+async def _fetch(cache, inflight, provider: str, fetch_fn) -> Any:
+    """Fetch and cache a value, sharing one request between concurrent callers."""
+    pending = inflight.get(provider)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    fut = asyncio.get_running_loop().create_future()
+    inflight[provider] = fut
+    try:
+        value = await fetch_fn()
+        cache[provider] = (time.time(), value)
+        fut.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()
+        raise
+    finally:
+        inflight.pop(provider, None)
@@ -7,17 +7,127 @@ with intelligent caching and fallback patterns for robust detection.
 """
 
 import asyncio
+import functools
 import json
 import logging
 import time
-from typing import Dict, List, Set, Optional, Any
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 import httpx
 from core.api_key_manager import api_key_manager
+from utils.model_cache import get_catalog
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Optional Aho-Corasick automaton for single-pass model id pattern matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger("model-compatibility")
 
+# Shared client so capability probes reuse pooled TCP/TLS connections
+# instead of opening a new client (and handshake) per request.
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+async def _get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+    return _HTTP_CLIENT
+
+# Provider keys resolved recently (including "no key"), so bulk probes don't
+# go back to the key manager, and its database fallback, once per model.
+_API_KEY_CACHE: Dict[str, Tuple[float, Optional[str]]] = {}
+_API_KEY_TTL = 300.0
+
+async def _get_cached_key(provider: str) -> Optional[str]:
+    """Return the provider's API key, resolving it at most once per TTL"""
+    now = time.monotonic()
+    cached = _API_KEY_CACHE.get(provider)
+    if cached is not None and now - cached[0] < _API_KEY_TTL:
+        return cached[1]
+    api_key = await api_key_manager.get_api_key(provider)
+    _API_KEY_CACHE[provider] = (now, api_key)
+    return api_key
+
+# Per-provider circuit breaker: (failures in window, window start, open until).
+# After CIRCUIT_FAILURE_THRESHOLD failures within CIRCUIT_WINDOW seconds the
+# provider is skipped for CIRCUIT_COOLDOWN seconds instead of timing out again.
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_WINDOW = 60.0
+CIRCUIT_COOLDOWN = 30.0
+_CIRCUIT: Dict[str, Tuple[int, float, float]] = {}
+
+def _circuit_open(provider: str) -> bool:
+    """Check whether probes to a provider are currently short-circuited"""
+    state = _CIRCUIT.get(provider)
+    return state is not None and time.monotonic() < state[2]
+
+def _record_failure(provider: str):
+    """Count a failed probe and open the circuit when the threshold is hit"""
+    now = time.monotonic()
+    failures, window_start, open_until = _CIRCUIT.get(provider, (0, now, 0.0))
+    if now - window_start > CIRCUIT_WINDOW:
+        failures, window_start = 0, now
+    failures += 1
+    if failures >= CIRCUIT_FAILURE_THRESHOLD:
+        logger.warning(f"{provider} probes failing; skipping API tests for {CIRCUIT_COOLDOWN:.0f}s")
+        _CIRCUIT[provider] = (0, now, now + CIRCUIT_COOLDOWN)
+    else:
+        _CIRCUIT[provider] = (failures, window_start, open_until)
+
+def _record_success(provider: str):
+    """Reset the provider's circuit after a successful probe"""
+    _CIRCUIT.pop(provider, None)
+
+# Provider model catalogs, indexed by model id and shared by every probe
+_CATALOG_TTL = 30 * 60
+_CATALOG_STALE_TTL = 60 * 60
+
+async def _provider_catalog(provider: str, url: str, timeout: float) -> Optional[Dict[str, dict]]:
+    """Return the provider's model catalog keyed by model id, fetched once per TTL"""
+    api_key = await _get_cached_key(provider)
+    if not api_key:
+        return None
+    
+    async def fetch() -> Dict[str, dict]:
+        client = await _get_client()
+        response = await client.get(url, headers={"Authorization": f"Bearer {api_key}"}, timeout=timeout)
+        # Raise rather than cache an empty catalog for a failed request
+        response.raise_for_status()
+        return {model.get("id"): model for model in response.json().get("data", [])}
+    
+    return await get_catalog(provider, fetch, ttl=_CATALOG_TTL, stale_ttl=_CATALOG_STALE_TTL)
+
+def invalidate_api_key_cache(provider: Optional[str] = None):
+    """Forget cached API keys after a key is stored or deleted"""
+    if provider is None:
+        _API_KEY_CACHE.clear()
+    else:
+        _API_KEY_CACHE.pop(provider, None)
+
+async def shutdown():
+    """Close the shared HTTP client (call on application exit)"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
 class ToolSupport(Enum):
     """Tool/function calling support levels"""
     FULL = "full"           # Supports parallel function calls
@@ -26,7 +136,7 @@ class ToolSupport(Enum):
     UNKNOWN = "unknown"     # Support status unknown
     TESTING = "testing"     # Currently being tested
 
-@dataclass
+@dataclass(slots=True)
 class ModelCapability:
     """Dynamic model capability information"""
     model_id: str
@@ -37,6 +147,8 @@ class ModelCapability:
     error_count: int = 0
     supports_streaming: bool = True
     context_length: Optional[int] = None
+    # Built by get_tool_support_recommendation; a refresh creates a new capability
+    cached_recommendation: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
     
     def is_stale(self, max_age_hours: int = 24) -> bool:
         """Check if capability data is stale"""
@@ -45,50 +157,97 @@ class ModelCapability:
     def supports_tools(self) -> bool:
         """Check if model supports any tool functionality"""
         return self.tool_support in [ToolSupport.FULL, ToolSupport.BASIC]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            "model_id": self.model_id,
+            "provider": self.provider,
+            "tool_support": self.tool_support.value,
+            "last_tested": self.last_tested,
+            "test_method": self.test_method,
+            "error_count": self.error_count,
+            "supports_streaming": self.supports_streaming,
+            "context_length": self.context_length,
+        }
 
 class ModelCapabilityDetector:
     """Dynamically detect model capabilities"""
     
+    # OpenRouter alone lists hundreds of models; keep the least recently used out
+    MAX_CACHE_SIZE = 2048
+    
     def __init__(self):
-        self.cache: Dict[str, ModelCapability] = {}
-        self.testing_queue: Set[str] = set()
+        self.cache: "OrderedDict[str, ModelCapability]" = OrderedDict()
+        # One shared test per key; concurrent callers await the same future
+        self._inflight: Dict[str, asyncio.Future] = {}
         self.known_patterns = {
             # Models we know don't support tools based on documented patterns
-            "no_tools": [
+            "no_tools": (
                 "perplexity/", "search/", "embedding/", "tts/", "stt/", 
                 "vision/", "dalle/", "stability/", "midjourney/", "whisper"
-            ],
+            ),
             # Models we know support tools
-            "has_tools": [
+            "has_tools": (
                 "gpt-", "claude-", "llama", "gemini", "mixtral", "command"
-            ]
+            )
         }
+        self._automaton = self._build_automaton() if AHOCORASICK_AVAILABLE else None
+        # The patterns are fixed for the detector's lifetime, so the result only
+        # depends on the model id; memoize it per instance.
+        self._detect_by_pattern = functools.lru_cache(maxsize=4096)(self._detect_by_pattern)
+    
+    def _build_automaton(self):
+        """Build one automaton over every known pattern, tagged with its support level"""
+        automaton = ahocorasick.Automaton()
+        for pattern in self.known_patterns["has_tools"]:
+            automaton.add_word(pattern, ToolSupport.FULL)
+        # Added last so a pattern in both lists resolves to NONE
+        for pattern in self.known_patterns["no_tools"]:
+            automaton.add_word(pattern, ToolSupport.NONE)
+        automaton.make_automaton()
+        return automaton
     
     async def get_model_capability(self, model_id: str, provider: str) -> ModelCapability:
         """Get model capability with dynamic detection"""
         cache_key = f"{provider}:{model_id}"
         
         # Check cache first
-        if cache_key in self.cache:
-            capability = self.cache[cache_key]
-            if not capability.is_stale():
-                return capability
+        capability = self.cache.get(cache_key)
+        if capability is not None and not capability.is_stale():
+            self.cache.move_to_end(cache_key)
+            return capability
         
-        # Prevent concurrent testing of same model
-        if cache_key in self.testing_queue:
-            # Wait briefly and check cache again
-            await asyncio.sleep(0.1)
-            if cache_key in self.cache:
-                return self.cache[cache_key]
+        # Share an in-progress test of the same model instead of starting another
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            # Shielded so a cancelled waiter doesn't cancel the shared result
+            return await asyncio.shield(inflight)
         
-        # Test the model capability
-        self.testing_queue.add(cache_key)
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = fut
         try:
             capability = await self._test_model_capability(model_id, provider)
-            self.cache[cache_key] = capability
+            self._cache_put(cache_key, capability)
+            fut.set_result(capability)
             return capability
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            # Mark the exception retrieved so an unawaited future doesn't log it
+            fut.exception()
+            raise
         finally:
-            self.testing_queue.discard(cache_key)
+            self._inflight.pop(cache_key, None)
+    
+    def _cache_put(self, cache_key: str, capability: ModelCapability):
+        """Store a capability, evicting the least recently used entry when full"""
+        self.cache[cache_key] = capability
+        self.cache.move_to_end(cache_key)
+        if len(self.cache) > self.MAX_CACHE_SIZE:
+            self.cache.popitem(last=False)
     
     async def _test_model_capability(self, model_id: str, provider: str) -> ModelCapability:
         """Test model capability by making actual API calls"""
@@ -139,6 +298,15 @@ class ModelCapabilityDetector:
         """Quick pattern-based detection"""
         model_lower = model_id.lower()
         
+        if self._automaton is not None:
+            # Single scan; any no-tools match still takes precedence
+            support = ToolSupport.UNKNOWN
+            for _, match in self._automaton.iter(model_lower):
+                if match is ToolSupport.NONE:
+                    return match
+                support = match
+            return support
+        
         # Check no-tools patterns first
         for pattern in self.known_patterns["no_tools"]:
             if pattern in model_lower:
@@ -153,70 +321,71 @@ class ModelCapabilityDetector:
     
     async def _test_openai_model(self, model_id: str) -> Optional[ToolSupport]:
         """Test OpenAI model by checking model info endpoint"""
+        if _circuit_open("openai"):
+            return None
         try:
-            api_key = await api_key_manager.get_api_key("openai")
+            api_key = await _get_cached_key("openai")
             if not api_key:
                 return None
             
-            async with httpx.AsyncClient() as client:
-                # Get model info from OpenAI API
-                response = await client.get(
-                    f"https://api.openai.com/v1/models/{model_id}",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    timeout=5.0
-                )
+            client = await _get_client()
+            # Get model info from OpenAI API
+            response = await client.get(
+                f"https://api.openai.com/v1/models/{model_id}",
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=5.0
+            )
+            # Outages and rate limits trip the breaker; other 4xx answers (an
+            # unknown model, say) leave it as it is
+            if response.status_code >= 500 or response.status_code == 429:
+                _record_failure("openai")
+                return None
                 
-                if response.status_code == 200:
-                    model_info = response.json()
-                    # Most OpenAI models support tools, but check for specific indicators
-                    if any(x in model_id for x in ["gpt-4", "gpt-3.5-turbo"]):
-                        return ToolSupport.FULL
-                    return ToolSupport.BASIC
+            if response.status_code == 200:
+                _record_success("openai")
+                model_info = response.json()
+                # Most OpenAI models support tools, but check for specific indicators
+                if any(x in model_id for x in ["gpt-4", "gpt-3.5-turbo"]):
+                    return ToolSupport.FULL
+                return ToolSupport.BASIC
                     
         except Exception as e:
+            _record_failure("openai")
             logger.debug(f"OpenAI model test failed: {e}")
         return None
     
     async def _test_openrouter_model(self, model_id: str) -> Optional[ToolSupport]:
         """Test OpenRouter model by checking their models endpoint"""
+        if _circuit_open("openrouter"):
+            return None
         try:
-            api_key = await api_key_manager.get_api_key("openrouter")
-            if not api_key:
-                return None
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://openrouter.ai/api/v1/models",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    timeout=10.0
-                )
+            catalog = await _provider_catalog("openrouter", "https://openrouter.ai/api/v1/models", 10.0)
+            _record_success("openrouter")
+            model = catalog.get(model_id) if catalog else None
+            if model is not None:
+                # Check if model supports function calling
+                architecture = model.get("architecture", "").lower()
+                name = model.get("name", "").lower()
                 
-                if response.status_code == 200:
-                    models_data = response.json()
-                    for model in models_data.get("data", []):
-                        if model.get("id") == model_id:
-                            # Check if model supports function calling
-                            architecture = model.get("architecture", "").lower()
-                            name = model.get("name", "").lower()
-                            
-                            # Perplexity models specifically don't support tools
-                            if "perplexity" in name or "sonar" in name:
-                                return ToolSupport.NONE
-                            
-                            # Most transformer models support tools
-                            if any(x in architecture for x in ["transformer", "llama", "claude", "gpt"]):
-                                return ToolSupport.FULL
-                            
-                            return ToolSupport.BASIC
+                # Perplexity models specifically don't support tools
+                if "perplexity" in name or "sonar" in name:
+                    return ToolSupport.NONE
+                
+                # Most transformer models support tools
+                if any(x in architecture for x in ["transformer", "llama", "claude", "gpt"]):
+                    return ToolSupport.FULL
+                
+                return ToolSupport.BASIC
                             
         except Exception as e:
+            _record_failure("openrouter")
             logger.debug(f"OpenRouter model test failed: {e}")
         return None
     
     async def _test_anthropic_model(self, model_id: str) -> Optional[ToolSupport]:
         """Test Anthropic model - most support tools"""
         try:
-            api_key = await api_key_manager.get_api_key("anthropic")
+            api_key = await _get_cached_key("anthropic")
             if not api_key:
                 return None
             
@@ -230,26 +399,17 @@ class ModelCapabilityDetector:
     
     async def _test_groq_model(self, model_id: str) -> Optional[ToolSupport]:
         """Test Groq model by checking their models endpoint"""
+        if _circuit_open("groq"):
+            return None
         try:
-            api_key = await api_key_manager.get_api_key("groq")
-            if not api_key:
-                return None
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.groq.com/openai/v1/models",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    timeout=5.0
-                )
-                
-                if response.status_code == 200:
-                    models_data = response.json()
-                    for model in models_data.get("data", []):
-                        if model.get("id") == model_id:
-                            # Most Groq models support tools
-                            return ToolSupport.FULL
+            catalog = await _provider_catalog("groq", "https://api.groq.com/openai/v1/models", 5.0)
+            _record_success("groq")
+            if catalog and model_id in catalog:
+                # Most Groq models support tools
+                return ToolSupport.FULL
                             
         except Exception as e:
+            _record_failure("groq")
             logger.debug(f"Groq model test failed: {e}")
         return None
     
@@ -281,7 +441,7 @@ class ModelCapabilityDetector:
     
     def get_cached_capabilities(self) -> Dict[str, ModelCapability]:
         """Get all cached model capabilities"""
-        return self.cache.copy()
+        return dict(self.cache)
     
     def clear_cache(self):
         """Clear the capability cache"""
@@ -304,6 +464,8 @@ async def should_disable_tools(model_id: str, provider: str) -> bool:
 async def get_tool_support_recommendation(model_id: str, provider: str) -> Dict[str, Any]:
     """Get comprehensive tool support recommendation"""
     capability = await capability_detector.get_model_capability(model_id, provider)
+    if capability.cached_recommendation is not None:
+        return dict(capability.cached_recommendation)
     
     warning_message = None
     if not capability.supports_tools():
@@ -312,7 +474,7 @@ async def get_tool_support_recommendation(model_id: str, provider: str) -> Dict[
         elif capability.tool_support == ToolSupport.UNKNOWN:
             warning_message = f"❓ Tool support for {model_id} is unknown. Tools may be disabled if they fail."
     
-    return {
+    capability.cached_recommendation = {
         "model_id": model_id,
         "provider": provider,
         "tool_support": capability.tool_support.value,
@@ -325,24 +487,26 @@ async def get_tool_support_recommendation(model_id: str, provider: str) -> Dict[
         "last_tested": capability.last_tested,
         "confidence": "high" if capability.test_method.endswith("_api") else "medium"
     }
+    return dict(capability.cached_recommendation)
 
-async def bulk_test_models(models: List[Dict[str, str]]) -> Dict[str, ModelCapability]:
-    """Test multiple models concurrently"""
-    tasks = []
-    for model_info in models:
-        task = capability_detector.get_model_capability(
-            model_info["id"], 
-            model_info["provider"]
-        )
-        tasks.append(task)
+async def bulk_test_models(models: List[Dict[str, str]], max_concurrency: int = 16) -> Dict[str, ModelCapability]:
+    """Test multiple models concurrently, at most *max_concurrency* at a time"""
+    sem = asyncio.Semaphore(max_concurrency)
+    
+    async def _bounded(model_info: Dict[str, str]) -> ModelCapability:
+        async with sem:
+            return await capability_detector.get_model_capability(
+                model_info["id"], 
+                model_info["provider"]
+            )
     
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    results = await asyncio.gather(*map(_bounded, models), return_exceptions=True)
     
     capabilities = {}
-    for i, result in enumerate(results):
+    for model_info, result in zip(models, results):
         if isinstance(result, Exception):
-            logger.error(f"Failed to test model {models[i]}: {result}")
+            logger.error(f"Failed to test model {model_info}: {result}")
             continue
-        capabilities[f"{models[i]['provider']}:{models[i]['id']}"] = result
+        capabilities[f"{model_info['provider']}:{model_info['id']}"] = result
     
-    return capabilities 
\ No newline at end of file
+    return capabilities
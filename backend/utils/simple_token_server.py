@@ -6,23 +6,87 @@ This server provides a simple HTTP endpoint for generating LiveKit tokens.
 """
 
 import os
-import json
+import sys
 import time
+import queue
+import logging
+import logging.handlers
 import uuid
-import jwt
-from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import secrets
+import orjson
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 
+# Allow running as a script (python utils/<name>.py) as well as importing
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.livekit_jwt import make_hs256_signer, video_grant
+
+# Request logging goes through a queue so handler threads never block on stdout;
+# set TOKEN_SERVER_LOG_LEVEL=WARNING to drop per-request lines entirely.
+logger = logging.getLogger("token_server")
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """Route token server logs through a background stdout writer."""
+    log_queue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(os.getenv("TOKEN_SERVER_LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(log_queue, stream)
+    listener.start()
+    return listener
+
 # LiveKit configuration
 LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY", "devkey")
 LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "your_secret_key_at_least_32_characters_long")
 
+_encode_hs256 = make_hs256_signer(LIVEKIT_API_SECRET)
+
+# Reloads and reconnects ask for the same room/participant token several times
+# within a second or two. Tokens are valid for hours, so the serialized response
+# is reused for a short window instead of re-signing every time.
+RESPONSE_CACHE_TTL = 2.0
+RESPONSE_CACHE_SIZE = 1024
+_response_cache: "OrderedDict[tuple, tuple[bytes, float]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def get_token_response(room_name: str = None, participant_name: str = None, preset_id: str = None) -> bytes:
+    """Return the JSON response body for a token request, reusing recent ones."""
+    # Without an explicit room and participant the server makes up fresh names,
+    # so those responses must never be shared between callers.
+    if not (room_name and participant_name):
+        token_data = generate_livekit_token(room_name, participant_name, preset_id)
+        return orjson.dumps(token_data)
+
+    key = (room_name, participant_name, preset_id)
+    now = time.monotonic()
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None and now - cached[1] < RESPONSE_CACHE_TTL:
+            _response_cache.move_to_end(key)
+            return cached[0]
+
+    token_data = generate_livekit_token(room_name, participant_name, preset_id)
+    body = orjson.dumps(token_data)
+    with _response_cache_lock:
+        _response_cache[key] = (body, now)
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return body
+
 def generate_livekit_token(room_name: str = None, participant_name: str = None, preset_id: str = None, duration_hours: int = 24):
     """Generate a LiveKit JWT token."""
     
+    now_ts = int(time.time())
+    
     if not room_name:
-        base_room_name = f"voice-assistant-{int(time.time())}"
+        base_room_name = f"voice-assistant-{now_ts}"
         # Include preset_id in room name if provided
         if preset_id:
             room_name = f"{base_room_name}--preset-{preset_id}"
@@ -30,10 +94,9 @@ def generate_livekit_token(room_name: str = None, participant_name: str = None,
             room_name = base_room_name
     
     if not participant_name:
-        participant_name = f"user-{uuid.uuid4().hex[:8]}"
+        participant_name = f"user-{secrets.token_hex(4)}"
     
-    now = datetime.utcnow()
-    exp = now + timedelta(hours=duration_hours)
+    exp_ts = now_ts + duration_hours * 3600
     
     metadata = {
         "participant_name": participant_name,
@@ -46,33 +109,30 @@ def generate_livekit_token(room_name: str = None, participant_name: str = None,
         "iss": LIVEKIT_API_KEY,
         "sub": LIVEKIT_API_KEY,
         "jti": str(uuid.uuid4()),
-        "nbf": int(now.timestamp()),
-        "exp": int(exp.timestamp()),
-        "video": {
-            "room": room_name,
-            "roomJoin": True,
-            "canPublish": True,
-            "canSubscribe": True,
-            "canPublishData": True
-        },
-        "metadata": json.dumps(metadata)
+        "nbf": now_ts,
+        "exp": exp_ts,
+        "video": video_grant(room_name),
+        "metadata": orjson.dumps(metadata).decode()
     }
     
-    token = jwt.encode(payload, LIVEKIT_API_SECRET, algorithm="HS256")
+    token = _encode_hs256(payload)
     
     return {
         "token": token,
         "room": room_name,
         "participant": participant_name,
-        "expires": exp.isoformat(),
+        "expires": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(exp_ts)),
         "livekit_url": os.getenv("LIVEKIT_URL", "ws://localhost:7880")
     }
 
 class SimpleTokenHandler(BaseHTTPRequestHandler):
+    # Every response carries Content-Length, so clients can keep connections open
+    protocol_version = "HTTP/1.1"
+    
     def do_GET(self):
         """Handle GET requests for token generation."""
         try:
-            print(f"Received request: {self.path}")
+            logger.debug("Received request: %s", self.path)
             
             # Parse query parameters
             parsed_url = urlparse(self.path)
@@ -82,8 +142,8 @@ class SimpleTokenHandler(BaseHTTPRequestHandler):
             participant_name = query_params.get('participant', [None])[0]
             preset_id = query_params.get('preset_id', [None])[0]
             
-            # Generate token
-            token_data = generate_livekit_token(room_name, participant_name, preset_id)
+            # Generate (or reuse) the serialized token response
+            response = get_token_response(room_name, participant_name, preset_id)
             
             # Set CORS headers
             self.send_response(200)
@@ -91,22 +151,23 @@ class SimpleTokenHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
             self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Content-Length', str(len(response)))
             self.end_headers()
             
             # Return JSON response
-            response = json.dumps(token_data, indent=2)
-            self.wfile.write(response.encode())
+            self.wfile.write(response)
             
-            print(f"Generated token for room: {token_data['room']}")
+            logger.info("Generated token for room: %s", room_name or "auto")
             
         except Exception as e:
-            print(f"Error handling request: {e}")
+            logger.error("Error handling request: %s", e)
             self.send_response(500)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_header('Content-Length', str(len(error_response)))
             self.end_headers()
-            error_response = json.dumps({"error": str(e)})
-            self.wfile.write(error_response.encode())
+            self.wfile.write(error_response)
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
@@ -114,11 +175,13 @@ class SimpleTokenHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def log_message(self, format, *args):
-        """Override to log messages to stdout"""
-        print(f"[{self.log_date_time_string()}] {format % args}")
+        """Send the access log through the queued logger"""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(format, *args)
 
 def main():
     """Start the simple token server."""
@@ -130,8 +193,9 @@ def main():
     print(f"🔑 API Key: {LIVEKIT_API_KEY}")
     print(f"🔐 API Secret: {LIVEKIT_API_SECRET[:10]}...")
     
+    listener = _start_log_listener()
     try:
-        server = HTTPServer((host, port), SimpleTokenHandler)
+        server = ThreadingHTTPServer((host, port), SimpleTokenHandler)
         print(f"✅ Token Server running on http://{host}:{port}")
         print(f"📝 Generate tokens: http://localhost:{port}/?room=myroom&participant=myuser")
         print(f"🛑 Press Ctrl+C to stop")
@@ -142,6 +206,8 @@ def main():
     except Exception as e:
         print(f"❌ Server error: {e}")
         raise
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,56 +3,63 @@
 Simple HTTP server for generating LiveKit tokens
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import json
-import jwt
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import os
+import sys
 import time
 import uuid
-from datetime import datetime, timedelta
+import secrets
+import orjson
 from urllib.parse import urlparse, parse_qs
 
+# Allow running as a script (python utils/<name>.py) as well as importing
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.livekit_jwt import make_hs256_signer, video_grant
+
 # LiveKit dev server configuration
 LIVEKIT_API_KEY = "devkey"
 LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "your_secret_key_at_least_32_characters_long")
 
+_encode_hs256 = make_hs256_signer(LIVEKIT_API_SECRET)
+
 def generate_livekit_token(room_name: str = None, participant_name: str = None, duration_hours: int = 24):
     """Generate a LiveKit JWT token."""
     
+    now_ts = int(time.time())
+    
     if not room_name:
-        room_name = f"voice-assistant-{int(time.time())}"
+        room_name = f"voice-assistant-{now_ts}"
     
     if not participant_name:
-        participant_name = f"user-{uuid.uuid4().hex[:8]}"
+        participant_name = f"user-{secrets.token_hex(4)}"
     
-    now = datetime.now()
-    exp = now + timedelta(hours=duration_hours)
+    exp_ts = now_ts + duration_hours * 3600
     
     payload = {
         "iss": LIVEKIT_API_KEY,
         "sub": LIVEKIT_API_KEY,
         "jti": str(uuid.uuid4()),
-        "nbf": int(now.timestamp()),
-        "exp": int(exp.timestamp()),
-        "video": {
-            "room": room_name,
-            "roomJoin": True,
-            "canPublish": True,
-            "canSubscribe": True,
-            "canPublishData": True
-        },
+        "nbf": now_ts,
+        "exp": exp_ts,
+        "video": video_grant(room_name),
         "metadata": f"participant_name:{participant_name}"
     }
     
-    token = jwt.encode(payload, LIVEKIT_API_SECRET, algorithm="HS256")
+    token = _encode_hs256(payload)
     
     return {
         "token": token,
         "room": room_name,
         "participant": participant_name,
-        "expires": exp.isoformat()
+        "expires": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(exp_ts))
     }
 
 class TokenHandler(BaseHTTPRequestHandler):
+    # Every response carries Content-Length, so clients can keep connections open
+    protocol_version = "HTTP/1.1"
+    
     def do_GET(self):
         """Handle GET requests for token generation."""
         try:
@@ -65,6 +72,7 @@ class TokenHandler(BaseHTTPRequestHandler):
             
             # Generate token
             token_data = generate_livekit_token(room_name, participant_name)
+            response = orjson.dumps(token_data)
             
             # Set CORS headers
             self.send_response(200)
@@ -72,20 +80,21 @@ class TokenHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
             self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Content-Length', str(len(response)))
             self.end_headers()
             
             # Return JSON response
-            response = json.dumps(token_data, indent=2)
-            self.wfile.write(response.encode())
+            self.wfile.write(response)
             
         except Exception as e:
             print(f"Error handling request: {e}")
             self.send_response(500)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_header('Content-Length', str(len(error_response)))
             self.end_headers()
-            error_response = json.dumps({"error": str(e)})
-            self.wfile.write(error_response.encode())
+            self.wfile.write(error_response)
     
     def log_message(self, format, *args):
         """Override to log messages to stdout"""
@@ -97,6 +106,7 @@ class TokenHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
 def main():
@@ -106,7 +116,7 @@ def main():
     print(f"📡 Binding to 0.0.0.0:{port}")
     
     try:
-        server = HTTPServer(('0.0.0.0', port), TokenHandler)
+        server = ThreadingHTTPServer(('0.0.0.0', port), TokenHandler)
         print(f"✅ LiveKit Token Server running on http://0.0.0.0:{port}")
         print(f"📝 Generate tokens: http://localhost:{port}/?room=myroom&participant=myuser")
         print(f"🛑 Press Ctrl+C to stop")
